@@ -0,0 +1,108 @@
+"""
+Micro-benchmark of the per-flush CPU cost of aggregate UPDATE statements.
+
+Compares executing the statements cached by ``AggregatedValue.cached_query``
+against rebuilding them on every flush, as was done before they were cached.
+Each run starts from a fresh database and the variants take turns, so that
+both aggregate the same number of rows.
+
+Usage::
+
+    python benchmarks/aggregated_updates.py
+"""
+
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.orm import declarative_base, Session
+
+from sqlalchemy_utils import aggregated, aggregates
+
+Base = declarative_base()
+
+
+class Comment(Base):
+    __tablename__ = 'comment'
+    id = sa.Column(sa.Integer, primary_key=True)
+    thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+
+
+class Category(Base):
+    __tablename__ = 'category'
+    id = sa.Column(sa.Integer, primary_key=True)
+    catalog_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    products = sa.orm.relationship('Product')
+
+
+class Product(Base):
+    __tablename__ = 'product'
+    id = sa.Column(sa.Integer, primary_key=True)
+    category_id = sa.Column(sa.Integer, sa.ForeignKey('category.id'))
+
+
+class Thread(Base):
+    __tablename__ = 'thread'
+    id = sa.Column(sa.Integer, primary_key=True)
+
+    @aggregated('comments', sa.Column(sa.Integer, default=0))
+    def comment_count(self):
+        return sa.func.count('1')
+
+    @aggregated('categories.products', sa.Column(sa.Integer, default=0))
+    def product_count(self):
+        return sa.func.count('1')
+
+    comments = sa.orm.relationship(Comment)
+    categories = sa.orm.relationship(Category)
+
+
+def rebuild_query(self, name, others=()):
+    return getattr(self, name)(sa.bindparam('aggregate_values', expanding=True), others)
+
+
+def run(flushes, cached):
+    """
+    Time given number of flushes on a fresh database, so that both variants
+    aggregate the same number of rows.
+    """
+    engine = sa.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    original = aggregates.AggregatedValue.cached_query
+    if not cached:
+        aggregates.AggregatedValue.cached_query = rebuild_query
+    try:
+        with Session(engine) as session:
+            thread = Thread()
+            category = Category()
+            thread.categories.append(category)
+            session.add(thread)
+            session.flush()
+
+            start = time.perf_counter()
+            for _ in range(flushes):
+                session.add(Comment(thread_id=thread.id))
+                session.add(Product(category_id=category.id))
+                session.flush()
+            return (time.perf_counter() - start) / flushes
+    finally:
+        aggregates.AggregatedValue.cached_query = original
+        engine.dispose()
+
+
+def main(flushes=500, repeat=5):
+    sa.orm.configure_mappers()
+    results = {True: [], False: []}
+    # alternate the variants so that neither one consistently runs first
+    for index in range(repeat):
+        for cached in (index % 2 == 0, index % 2 != 0):
+            results[cached].append(run(flushes, cached))
+    cached = min(results[True])
+    rebuilt = min(results[False])
+
+    print(f'rebuilt statements: {rebuilt * 1e6:8.1f} us per flush')
+    print(f'cached statements:  {cached * 1e6:8.1f} us per flush')
+    print(f'saved:              {(rebuilt - cached) * 1e6:8.1f} us per flush')
+
+
+if __name__ == '__main__':
+    main()
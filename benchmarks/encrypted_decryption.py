@@ -0,0 +1,59 @@
+"""
+Benchmark of decrypting a large encrypted result column.
+
+Compares decrypting the values one at a time with
+``StringEncryptedType.process_result_value``, as done when the rows are
+fetched, against ``StringEncryptedType.decrypt_many`` with a single thread
+and with a thread pool.
+
+Usage::
+
+    python benchmarks/encrypted_decryption.py [rows] [value length] [workers]
+"""
+
+import os
+import sys
+import timeit
+
+import sqlalchemy as sa
+
+from sqlalchemy_utils import StringEncryptedType
+from sqlalchemy_utils.types.encrypted.encrypted_type import (
+    AesEngine,
+    AesGcmEngine,
+    FernetEngine,
+)
+
+
+def run(rows=100000, length=200, workers=None):
+    workers = workers or os.cpu_count()
+    print(f'{rows} values of {length} characters, {workers} workers')
+    for engine in (AesEngine, AesGcmEngine, FernetEngine):
+        type_ = StringEncryptedType(sa.Unicode, 'secret', engine, 'pkcs5')
+        values = [
+            type_.process_bind_param(f'{index:0{length}d}', None)
+            for index in range(rows)
+        ]
+
+        def per_row():
+            return [type_.process_result_value(value, None) for value in values]
+
+        def single_thread():
+            return type_.decrypt_many(values, max_workers=1)
+
+        def thread_pool():
+            return type_.decrypt_many(values, max_workers=workers)
+
+        assert per_row() == single_thread() == thread_pool()
+        print(f'{engine.__name__}:')
+        for name, function in [
+            ('per row', per_row),
+            ('decrypt_many, 1 thread', single_thread),
+            (f'decrypt_many, {workers} threads', thread_pool),
+        ]:
+            duration = min(timeit.repeat(function, number=1, repeat=3))
+            print(f'    {name:28} {duration * 1e6 / rows:6.2f} us per value')
+
+
+if __name__ == '__main__':
+    run(*map(int, sys.argv[1:]))
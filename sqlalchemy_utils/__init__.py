@@ -1,4 +1,11 @@
-from .aggregates import aggregated  # noqa
+from .aggregates import (  # noqa
+    aggregated,
+    flush_aggregates,
+    prefetch_aggregates,
+    recompute_aggregates,
+    track_bulk_aggregates,
+    verify_aggregates,
+)
 from .asserts import (  # noqa
     assert_max_length,
     assert_max_value,
@@ -52,7 +59,7 @@ from .listeners import (  # noqa
     force_instant_defaults,
 )
 from .models import generic_repr, Timestamp  # noqa
-from .observer import observes  # noqa
+from .observer import observes, prefetch_observed, track_bulk_observers  # noqa
 from .primitives import Country, Currency, Ltree, WeekDay, WeekDays  # noqa
 from .proxy_dict import proxy_dict, ProxyDict  # noqa
 from .query_chain import QueryChain  # noqa
@@ -76,6 +83,7 @@ from .types import (  # noqa
     IntRangeType,
     IPAddressType,
     JSONType,
+    Keyring,
     LocaleType,
     LtreeType,
     NumericRangeType,
@@ -84,6 +92,7 @@ from .types import (  # noqa
     PhoneNumber,
     PhoneNumberParseException,
     PhoneNumberType,
+    reencrypt_column,
     register_composites,
     remove_composite_listeners,
     ScalarListException,
@@ -211,6 +211,14 @@ define the relationships as viewonly when possible.
         customer_id = sa.Column(sa.Integer, sa.ForeignKey(Customer.id))
 
 
+Aggregates of the same class which are affected by the same rows are updated
+with a single ``UPDATE customer SET orders_sum = (...), invoiced_orders_sum =
+(...)`` statement. On PostgreSQL, aggregates over the same relationship that
+use the count, sum, min, max or avg functions are computed with a single
+``UPDATE ... FROM`` grouped select, so the aggregated table is scanned only
+once regardless of the number of aggregates.
+
+
 Many-to-Many aggregates
 -----------------------
 
@@ -307,6 +315,223 @@ categories.
         category_id = sa.Column(sa.Integer, sa.ForeignKey(Category.id))
 
 
+Large updates
+-------------
+
+The rows to update are identified with an IN list of the values found in the
+flushed objects. Duplicate values are removed and the list is split into
+chunks of :attr:`AggregationManager.chunk_size` values, so that bulk inserts
+of lots of objects don't exceed the parameter limits of databases such as
+SQLite and MSSQL. When there are more values than
+:attr:`AggregationManager.temporary_table_threshold`, they are instead
+inserted into a temporary table which the update statement selects from.
+
+::
+
+
+    from sqlalchemy_utils import aggregates
+
+
+    aggregates.manager.chunk_size = 500
+    aggregates.manager.temporary_table_threshold = 50000
+
+
+Recomputing aggregates
+----------------------
+
+Aggregates are only updated when related objects change through the ORM.
+When an aggregated column is added to an existing table, or the related
+rows were modified with bulk SQL, use :func:`recompute_aggregates` to
+recompute the stored values in batches.
+
+::
+
+
+    from sqlalchemy_utils import recompute_aggregates
+
+
+    recompute_aggregates(session, Thread.comment_count, batch_size=10000)
+
+
+:func:`verify_aggregates` can be used for finding, and optionally
+repairing, the rows whose stored aggregates differ from the computed values.
+Checking a sample of the rows regularly is a cheap way to detect drift.
+
+::
+
+
+    from sqlalchemy_utils import verify_aggregates
+
+
+    verify_aggregates(session, Thread, sample=0.01, repair=True)
+
+
+Bulk operations
+---------------
+
+ORM-enabled INSERT, UPDATE and DELETE statements executed with
+``session.execute()`` bypass the unit of work and therefore don't update
+aggregates by default. :func:`track_bulk_aggregates` makes the given session,
+sessionmaker or Session class recompute the aggregates affected by such
+statements. The affected parent rows are derived from the parameter sets of
+the statement, or from the rows matching its WHERE criteria before and after
+it is executed.
+
+::
+
+
+    from sqlalchemy_utils import track_bulk_aggregates
+
+
+    track_bulk_aggregates(session)
+
+    session.execute(
+        sa.insert(Comment),
+        [{'thread_id': 1}, {'thread_id': 2}]
+    )
+    session.execute(
+        sa.update(Comment).where(Comment.thread_id == 1).values(thread_id=2)
+    )
+
+
+The legacy ``Session.bulk_*`` methods don't emit any session events and
+therefore aren't supported. Use the equivalent ORM-enabled statements
+instead.
+
+
+.. _async-aggregates:
+
+Async sessions
+--------------
+
+Aggregates work with :class:`~sqlalchemy.ext.asyncio.AsyncSession` as well,
+since its flushes run the event listeners of the underlying synchronous
+session. Each statement executed during the flush is an additional round trip
+through the event loop, so the options reducing the number of statements
+matter even more: aggregates sharing a condition are updated with a single
+statement, and deferred aggregates are updated only once per transaction.
+
+The aggregates read the foreign keys, and for incremental aggregates the
+aggregated values, of the changed objects. If these have been expired, for
+example by a previous commit, they are loaded one object at a time. Awaiting
+:func:`prefetch_aggregates` before flushing or committing loads them with one
+query per mapper beforehand.
+
+::
+
+    from sqlalchemy_utils import prefetch_aggregates
+
+
+    async with AsyncSession(engine) as session:
+        for comment in comments:
+            await session.delete(comment)
+        await prefetch_aggregates(session)
+        await session.commit()
+
+
+.. _incremental-aggregates:
+
+Incremental aggregates
+----------------------
+
+By default each aggregate is recomputed with a correlated subquery over all
+the related rows whenever any of them changes. For large relationships this
+means scanning lots of child rows on every flush. Count and sum aggregates
+can instead be maintained incrementally: the change caused by the flushed
+objects is computed in Python and added to the stored value.
+
+::
+
+
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0), incremental=True)
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+
+
+This issues statements such as
+``UPDATE thread SET comment_count = coalesce(comment_count, 0) + ? WHERE
+thread.id = ?``. Incremental maintenance is only used for count and sum
+aggregates over a single one-to-many relationship without additional join
+conditions. Other aggregates marked as incremental silently fall back to full
+recomputation.
+
+.. note::
+
+    Incremental aggregates rely on the stored value being correct to begin
+    with. Changes made outside of the ORM unit of work (for example bulk
+    updates) are not tracked.
+
+
+.. _deferred-aggregates:
+
+Deferred aggregates
+-------------------
+
+Aggregates are normally updated after every flush. Code that flushes many
+times within a single transaction, for example due to autoflush, therefore
+updates the same aggregates over and over again. Deferred aggregates collect
+the affected rows from each flush and update each aggregate only once, right
+before the transaction is committed.
+
+::
+
+
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0), deferred=True)
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+
+
+Until then the stored value may be stale. Use :func:`flush_aggregates` to
+update deferred aggregates in the middle of a transaction. Deferred
+aggregates can also be incremental, in which case the deltas of each flush
+are summed up and applied once.
+
+
+.. _trigger-aggregates:
+
+Trigger aggregates
+------------------
+
+Aggregates can also be maintained by database triggers instead of ORM
+event listeners. This saves the additional round trips of the update
+statements, and keeps the aggregates up to date even when the related rows
+are modified outside of the ORM.
+
+::
+
+
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0), trigger=True)
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+
+
+The triggers are created on the table containing the foreign key to the
+parent, when the metadata is created with ``metadata.create_all()``, and
+fire after inserts, deletes and updates of the columns the aggregate depends
+on. Count and sum aggregates over a single relationship are updated
+incrementally, other aggregates are recomputed for the affected parents.
+Triggers are supported on PostgreSQL and SQLite. Many-to-many aggregates
+are not supported and keep using the ORM listeners.
+
+
 Examples
 --------
 
@@ -361,51 +586,62 @@ TODO
 
 """
 
+import itertools
+import random
 from collections import defaultdict
 from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
 import sqlalchemy.event
 import sqlalchemy.orm
+from sqlalchemy.ext import compiler
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm.base import NO_VALUE
+from sqlalchemy.schema import DDLElement
 from sqlalchemy.sql.functions import _FunctionGenerator
 
 from .functions.orm import get_column_key
+from .instrumentation import instrumentation
 from .relationships import (
+    adapt_expr,
     chained_join,
     path_to_relationships,
     select_correlated_expression,
 )
+from .utils import chunks
 
 aggregated_attrs = WeakKeyDictionary()
 
 
 class AggregatedAttribute(declared_attr):
-    def __init__(self, fget, relationship, column, *args, **kwargs):
+    def __init__(self, fget, relationship, column, *args, options=None, **kwargs):
         super().__init__(fget, *args, **kwargs)
         self.__doc__ = fget.__doc__
         self.column = column
         self.relationship = relationship
+        self.options = options or {}
 
     def __get__(desc, self, cls):
-        value = (desc.fget, desc.relationship, desc.column)
+        value = (desc.fget, desc.relationship, desc.column, desc.options)
         if cls not in aggregated_attrs:
             aggregated_attrs[cls] = [value]
         else:
             aggregated_attrs[cls].append(value)
+        if desc.options.get('trigger'):
+            register_trigger_listeners(cls, desc.column)
         return desc.column
 
 
-def local_condition(prop, objects):
+def local_columns(prop):
     pairs = prop.local_remote_pairs
     if prop.secondary is not None:
-        parent_column = pairs[1][0]
-        fetched_column = pairs[1][0]
+        return pairs[1][0], pairs[1][0]
     else:
-        parent_column = pairs[0][0]
-        fetched_column = pairs[0][1]
+        return pairs[0][0], pairs[0][1]
+
 
-    key = get_column_key(prop.mapper, fetched_column)
+def local_values(prop, objects):
+    key = get_column_key(prop.mapper, local_columns(prop)[1])
 
     values = []
     for obj in objects:
@@ -413,9 +649,21 @@ def local_condition(prop, objects):
             values.append(getattr(obj, key))
         except sa.orm.exc.ObjectDeletedError:
             pass
+        values.extend(
+            value
+            for value in sa.inspect(obj).attrs[key].history.deleted
+            if value is not None
+        )
+    return values
+
 
-    if values:
-        return parent_column.in_(values)
+def values_condition(prop, values):
+    if isinstance(values, sa.sql.ClauseElement) or values:
+        return local_columns(prop)[0].in_(values)
+
+
+def local_condition(prop, objects):
+    return values_condition(prop, local_values(prop, objects))
 
 
 def aggregate_expression(expr, class_):
@@ -427,13 +675,231 @@ def aggregate_expression(expr, class_):
         return expr(class_)
 
 
+def incremental_function(expr):
+    """
+    Return the name of the decomposable aggregate function of given
+    expression, or None if the aggregate can not be maintained incrementally.
+    """
+    if (
+        isinstance(expr, sa.sql.functions.FunctionElement)
+        and expr.name.lower() in ('count', 'sum')
+        and len(expr.clauses.clauses) <= 1
+    ):
+        return expr.name.lower()
+
+
+def history_values(state, key):
+    """
+    Return the pre-flush and post-flush values of given attribute as a tuple.
+    Values that are not loaded are returned as ``NO_VALUE``.
+    """
+    history = state.attrs[key].history
+    old = history.deleted or history.unchanged
+    new = history.added or history.unchanged
+    return (
+        old[0] if old else NO_VALUE,
+        new[0] if new else NO_VALUE,
+    )
+
+
 class AggregatedValue:
-    def __init__(self, class_, attr, path, expr):
+    def __init__(
+        self,
+        class_,
+        attr,
+        path,
+        expr,
+        incremental=False,
+        deferred=False,
+        trigger=False,
+    ):
         self.class_ = class_
+        self.deferred = deferred
         self.attr = attr
         self.path = path
         self.relationships = list(reversed(path_to_relationships(path, class_)))
         self.expr = aggregate_expression(expr, class_)
+        self.incremental = incremental and self.is_decomposable
+        self.trigger = trigger and self.relationships[0].property.secondary is None
+        self.compiled_queries = {}
+        self.dependencies = self.get_dependencies()
+        self.track_previous_values()
+
+    def get_dependencies(self):
+        """
+        Return the keys of the attributes of the aggregated class which this
+        aggregate depends on, or None if they can not be determined. These
+        include the columns referenced by the aggregate expression and the
+        columns linking the aggregated objects to their parents. Textual SQL
+        and literal columns may reference any column, so they can not be
+        tracked.
+        """
+        prop = self.relationships[0].property
+        if prop.secondary is not None:
+            return None
+        mapper = prop.mapper
+        tables = set(mapper.tables)
+        keys = set()
+        for clause in (self.expr, prop.primaryjoin):
+            for element in sa.sql.visitors.iterate(clause):
+                if isinstance(element, sa.sql.elements.TextClause):
+                    if element.text != '1':
+                        return None
+                elif isinstance(element, sa.sql.elements.ColumnClause):
+                    if not isinstance(element, sa.Column):
+                        return None
+                    if element.table not in tables:
+                        continue
+                    try:
+                        keys.add(get_column_key(mapper, element))
+                    except sa.orm.exc.UnmappedColumnError:
+                        return None
+        return keys
+
+    def is_affected_by(self, state, ctx):
+        """
+        Return whether or not the flush of given object state can change the
+        value of this aggregate.
+        """
+        if (
+            self.dependencies is None
+            or state.key is None
+            or ctx.states.get(state, (False, False))[0]
+        ):
+            return True
+        return any(state.attrs[key].history.has_changes() for key in self.dependencies)
+
+    @property
+    def is_decomposable(self):
+        """
+        Whether or not this aggregate can be maintained by applying deltas
+        instead of recomputing it. Only count and sum aggregates over a single
+        one-to-many relationship without additional join criteria qualify.
+        """
+        if len(self.relationships) != 1 or incremental_function(self.expr) is None:
+            return False
+        prop = self.relationships[0].property
+        if prop.secondary is not None or len(prop.local_remote_pairs) != 1:
+            return False
+        local, remote = prop.local_remote_pairs[0]
+        if local.table is not self.class_.__table__:
+            return False
+        if not (
+            isinstance(prop.primaryjoin, sa.sql.elements.BinaryExpression)
+            and prop.primaryjoin.operator is sa.sql.operators.eq
+        ):
+            return False
+        argument = self.aggregated_column
+        if argument is None:
+            return True
+        return isinstance(argument, sa.Column) and argument.table is remote.table
+
+    @property
+    def name(self):
+        return f'{self.class_.__name__}.{self.attr.name}'
+
+    @property
+    def aggregated_column(self):
+        clauses = self.expr.clauses.clauses
+        if clauses and isinstance(clauses[0], sa.Column):
+            return clauses[0]
+        elif clauses and not isinstance(
+            clauses[0], (sa.sql.elements.BindParameter, sa.sql.elements.TextClause)
+        ):
+            return clauses[0]
+
+    def track_previous_values(self):
+        """
+        Make the attributes this aggregate depends on load their previous
+        value when changed, so that the value they had before the flush is
+        known even if it was not loaded. This allows updating the previous
+        parent of an object that was moved to another parent.
+        """
+        prop = self.relationships[0].property
+        columns = []
+        if prop.secondary is None:
+            columns.append(local_columns(prop)[1])
+        if self.incremental and self.aggregated_column is not None:
+            columns.append(self.aggregated_column)
+        for mapper in prop.mapper.self_and_descendants:
+            for column in columns:
+                try:
+                    key = get_column_key(mapper, column)
+                except sa.orm.exc.UnmappedColumnError:
+                    continue
+                mapper.class_manager[key].impl.active_history = True
+
+    def contribution(self, value):
+        if incremental_function(self.expr) == 'count':
+            return 0 if value is None else 1
+        return value or 0
+
+    def delta_params(self, objects, ctx):
+        """
+        Return a tuple of (deltas, recompute) where deltas maps parent keys to
+        the net change of this aggregate caused by given objects during the
+        flush, and recompute is a set of parent keys that could not be
+        resolved incrementally and need a full recompute.
+        """
+        prop = self.relationships[0].property
+        fk_key = get_column_key(prop.mapper, prop.local_remote_pairs[0][1])
+        column = self.aggregated_column
+        value_key = get_column_key(prop.mapper, column) if column is not None else None
+        deltas = defaultdict(int)
+        recompute = set()
+        for obj in objects:
+            state = sa.inspect(obj)
+            isdelete = ctx.states.get(state, (False, False))[0]
+            old_parent, new_parent = history_values(state, fk_key)
+            if value_key is None:
+                old_value = new_value = 1
+            else:
+                old_value, new_value = history_values(state, value_key)
+
+            if isdelete:
+                if old_parent is NO_VALUE:
+                    continue
+                if old_value is NO_VALUE:
+                    recompute.add(old_parent)
+                    continue
+                new_parent = None
+            else:
+                if new_parent is NO_VALUE:
+                    old_parent = new_parent = getattr(obj, fk_key)
+                if new_value is NO_VALUE:
+                    old_value = new_value = getattr(obj, value_key)
+                if state.key is None:
+                    old_parent = None
+
+            if old_parent is not None:
+                deltas[old_parent] -= self.contribution(old_value)
+            if new_parent is not None:
+                deltas[new_parent] += self.contribution(new_value)
+
+        return {key: delta for key, delta in deltas.items() if delta}, recompute
+
+    def delta_query(self):
+        if 'delta_query' not in self.compiled_queries:
+            self.compiled_queries['delta_query'] = self.build_delta_query()
+        return self.compiled_queries['delta_query']
+
+    def build_delta_query(self):
+        """
+        Return an UPDATE statement which adds a delta to the aggregate column
+        of a single parent row. Meant to be executed with a list of
+        ``aggregate_key`` and ``aggregate_delta`` parameter dictionaries.
+        """
+        parent_column = self.relationships[0].property.local_remote_pairs[0][0]
+        return (
+            self.class_.__table__.update()
+            .where(parent_column == sa.bindparam('aggregate_key'))
+            .values(
+                {
+                    self.attr: sa.func.coalesce(self.attr, 0)
+                    + sa.bindparam('aggregate_delta', type_=self.attr.type)
+                }
+            )
+        )
 
     @property
     def aggregate_query(self):
@@ -443,12 +909,68 @@ class AggregatedValue:
 
         return query.scalar_subquery()
 
+    def local_values(self, objects):
+        """
+        Return the values identifying the parent rows affected by given
+        objects. These are passed to :meth:`values_update_query`.
+        """
+        return local_values(self.relationships[0].property, objects)
+
     def update_query(self, objects):
+        return self.values_update_query(self.local_values(objects))
+
+    def cached_query(self, name, others=()):
+        """
+        Return a statement of this aggregate which takes the values
+        identifying the parent rows as an expanding ``aggregate_values``
+        bind parameter. Statements are built only once, so that repeated
+        flushes reuse the same statement object and hit the compiled cache of
+        SQLAlchemy.
+
+        :param name: 'values_update_query' or 'update_from_query'
+        :param others: Other aggregated values updated by the same statement
+        """
+        key = (name, tuple(others))
+        if key not in self.compiled_queries:
+            self.compiled_queries[key] = getattr(self, name)(
+                sa.bindparam('aggregate_values', expanding=True), others
+            )
+        return self.compiled_queries[key]
+
+    @property
+    def condition_key(self):
+        """
+        Aggregated values of the same class with equal condition keys update
+        the same rows for the same values, and can therefore be updated with
+        a single statement.
+        """
+        if len(self.relationships) == 1:
+            return (
+                self.class_.__table__,
+                local_columns(self.relationships[0].property),
+            )
+        return (
+            self.class_.__table__,
+            tuple(relationship.property for relationship in self.relationships),
+        )
+
+    def values_update_query(self, values, others=()):
+        """
+        Return an UPDATE statement recomputing this aggregate for the parent
+        rows identified by given values.
+
+        :param values: Values returned by :meth:`local_values`
+        :param others:
+            Other aggregated values with the same :attr:`condition_key`
+            whose columns are set by the same statement.
+        """
         table = self.class_.__table__
-        query = table.update().values({self.attr: self.aggregate_query})
+        query = table.update().values(
+            {value.attr: value.aggregate_query for value in (self, *others)}
+        )
         if len(self.relationships) == 1:
             prop = self.relationships[-1].property
-            condition = local_condition(prop, objects)
+            condition = values_condition(prop, values)
             if condition is not None:
                 return query.where(condition)
         else:
@@ -466,7 +988,7 @@ class AggregatedValue:
             remote_pairs = property_.local_remote_pairs
             local = remote_pairs[0][0]
             remote = remote_pairs[0][1]
-            condition = local_condition(self.relationships[0].property, objects)
+            condition = values_condition(self.relationships[0].property, values)
             if condition is not None:
                 return query.where(
                     local.in_(
@@ -476,13 +998,339 @@ class AggregatedValue:
                     )
                 )
 
+    def grouped_expression(self):
+        """
+        Return the aggregate expression in a form that can be evaluated over
+        a parent table outer joined with the aggregated table, or None if that
+        would change its result.
+        """
+        if not isinstance(self.expr, sa.sql.functions.FunctionElement):
+            return None
+        name = self.expr.name.lower()
+        if name not in ('count', 'sum', 'min', 'max', 'avg'):
+            return None
+        column = self.aggregated_column
+        if column is None and name == 'count':
+            # count(*) would count the NULL row of parents without children.
+            mapper = self.relationships[0].mapper
+            return sa.func.count(mapper.primary_key[0])
+        return self.expr if isinstance(column, sa.Column) else None
+
+    def grouped_query(self, values, others=(), name='grouped'):
+        """
+        Return a subquery which computes this and given other aggregates for
+        the parent rows identified by given values by grouping the aggregated
+        table once, or None if the aggregates can not be computed that way.
+        The parent key is available as the ``aggregate_key`` column and each
+        aggregate as a column named after its aggregated column.
+        """
+        aggregate_values = (self, *others)
+        prop = self.relationships[0].property
+        if (
+            len(self.relationships) != 1
+            or prop.secondary is not None
+            or len(prop.local_remote_pairs) != 1
+            or any(value.relationships[0].property is not prop for value in others)
+        ):
+            return None
+        table = self.class_.__table__
+        local, remote = prop.local_remote_pairs[0]
+        if local.table is not table or remote.table is table:
+            return None
+        expressions = [value.grouped_expression() for value in aggregate_values]
+        if any(expression is None for expression in expressions):
+            return None
+
+        parent = table.alias()
+        key = parent.c[local.key]
+        columns = [key.label('aggregate_key')] + [
+            expression.label(value.attr.name)
+            for value, expression in zip(aggregate_values, expressions)
+        ]
+        return (
+            sa.select(*columns)
+            .select_from(
+                parent.outerjoin(remote.table, adapt_expr(prop.primaryjoin, parent))
+            )
+            .where(key.in_(values))
+            .group_by(key)
+            .subquery(name)
+        )
+
+    def update_from_query(self, values, others=()):
+        """
+        Return an UPDATE ... FROM statement which computes this and given
+        other aggregates by grouping the aggregated table once, or None if the
+        aggregates can not be computed that way.
+
+        The statement looks like::
+
+            UPDATE customer SET orders_sum = grouped.orders_sum,
+                order_count = grouped.order_count
+            FROM (
+                SELECT customer_1.id AS aggregate_key,
+                    sum(order.price) AS orders_sum,
+                    count(order.id) AS order_count
+                FROM customer AS customer_1
+                LEFT OUTER JOIN order ON customer_1.id = order.customer_id
+                WHERE customer_1.id IN (...)
+                GROUP BY customer_1.id
+            ) AS grouped
+            WHERE customer.id = grouped.aggregate_key
+        """
+        grouped = self.grouped_query(values, others)
+        if grouped is None:
+            return None
+        local = local_columns(self.relationships[0].property)[0]
+        return (
+            self.class_.__table__.update()
+            .values(
+                {value.attr: grouped.c[value.attr.name] for value in (self, *others)}
+            )
+            .where(local == grouped.c.aggregate_key)
+        )
+
+    @property
+    def trigger_table(self):
+        """
+        The table containing the column which links the aggregated rows to
+        their parents. Database triggers of this aggregate are created on it.
+        """
+        return local_columns(self.relationships[0].property)[1].table
+
+    @property
+    def trigger_name(self):
+        return f'{self.class_.__table__.name}_{self.attr.name}'.lower()
+
+    def trigger_columns(self):
+        """
+        Return the names of the columns of :attr:`trigger_table` which this
+        aggregate depends on.
+        """
+        columns = []
+        for clause in (self.expr, self.relationships[0].property.primaryjoin):
+            for element in sa.sql.visitors.iterate(clause):
+                if (
+                    isinstance(element, sa.Column)
+                    and element.table is self.trigger_table
+                ):
+                    columns.append(element.name)
+        return list(dict.fromkeys(columns))
+
+    def trigger_queries(self, operation, preparer):
+        """
+        Return the UPDATE statements a database trigger executes after given
+        operation on a row of :attr:`trigger_table`. Decomposable aggregates
+        are updated by adding or subtracting the contribution of the OLD and
+        NEW rows, others are recomputed for the affected parents.
+
+        :param operation: 'INSERT', 'UPDATE' or 'DELETE'
+        :param preparer: Identifier preparer of the dialect
+        """
+        references = {
+            'INSERT': [('NEW', 1)],
+            'UPDATE': [('OLD', -1), ('NEW', 1)],
+            'DELETE': [('OLD', -1)],
+        }[operation]
+        fetched_column = local_columns(self.relationships[0].property)[1]
+        queries = []
+        for reference, sign in references:
+
+            def row_column(column):
+                return sa.literal_column(f'{reference}.{preparer.quote(column.name)}')
+
+            if self.is_decomposable:
+                parent_column = local_columns(self.relationships[0].property)[0]
+                column = self.aggregated_column
+                if incremental_function(self.expr) == 'sum':
+                    delta = sa.func.coalesce(row_column(column), 0)
+                elif column is not None:
+                    delta = sa.case((row_column(column).is_(None), 0), else_=1)
+                else:
+                    delta = sa.literal_column('1')
+                queries.append(
+                    self.class_.__table__.update()
+                    .where(parent_column == row_column(fetched_column))
+                    .values(
+                        {
+                            self.attr: sa.func.coalesce(self.attr, 0) + delta
+                            if sign > 0
+                            else sa.func.coalesce(self.attr, 0) - delta
+                        }
+                    )
+                )
+            else:
+                queries.append(self.values_update_query([row_column(fetched_column)]))
+        return queries
+
+
+class CreateAggregateTriggerFunction(DDLElement):
+    def __init__(self, aggregate_value, operation):
+        self.aggregate_value = aggregate_value
+        self.operation = operation
+
+
+@compiler.compiles(CreateAggregateTriggerFunction, 'postgresql')
+def compile_create_aggregate_trigger_function(element, compiler, **kw):
+    queries = element.aggregate_value.trigger_queries(
+        element.operation, compiler.dialect.identifier_preparer
+    )
+    return (
+        'CREATE OR REPLACE FUNCTION {}() RETURNS TRIGGER AS $$\n'
+        'BEGIN\n{}\nRETURN NULL;\nEND;\n$$ LANGUAGE plpgsql'
+    ).format(
+        compiler.dialect.identifier_preparer.quote(
+            f'{element.aggregate_value.trigger_name}_{element.operation.lower()}'
+        ),
+        '\n'.join(
+            compiler.sql_compiler.process(query, literal_binds=True) + ';'
+            for query in queries
+        ),
+    )
+
+
+class CreateAggregateTrigger(DDLElement):
+    def __init__(self, aggregate_value, operation):
+        self.aggregate_value = aggregate_value
+        self.operation = operation
+
+
+def aggregate_trigger_event(element, compiler, if_not_exists=False):
+    preparer = compiler.dialect.identifier_preparer
+    aggregate_value = element.aggregate_value
+    event = element.operation
+    if event == 'UPDATE':
+        event += ' OF ' + ', '.join(
+            preparer.quote(name) for name in aggregate_value.trigger_columns()
+        )
+    return 'CREATE TRIGGER {}{} AFTER {} ON {} FOR EACH ROW'.format(
+        'IF NOT EXISTS ' if if_not_exists else '',
+        preparer.quote(f'{aggregate_value.trigger_name}_{element.operation.lower()}'),
+        event,
+        preparer.format_table(aggregate_value.trigger_table),
+    )
+
+
+@compiler.compiles(CreateAggregateTrigger, 'postgresql')
+def compile_create_aggregate_trigger_postgresql(element, compiler, **kw):
+    return '{} EXECUTE PROCEDURE {}()'.format(
+        aggregate_trigger_event(element, compiler),
+        compiler.dialect.identifier_preparer.quote(
+            f'{element.aggregate_value.trigger_name}_{element.operation.lower()}'
+        ),
+    )
+
+
+@compiler.compiles(CreateAggregateTrigger, 'sqlite')
+def compile_create_aggregate_trigger_sqlite(element, compiler, **kw):
+    queries = element.aggregate_value.trigger_queries(
+        element.operation, compiler.dialect.identifier_preparer
+    )
+    return '{}\nBEGIN\n{}\nEND'.format(
+        aggregate_trigger_event(element, compiler, if_not_exists=True),
+        '\n'.join(
+            compiler.sql_compiler.process(query, literal_binds=True) + ';'
+            for query in queries
+        ),
+    )
+
+
+class DropExistingAggregateTrigger(DDLElement):
+    def __init__(self, aggregate_value, operation):
+        self.aggregate_value = aggregate_value
+        self.operation = operation
+
+
+@compiler.compiles(DropExistingAggregateTrigger, 'postgresql')
+def compile_drop_existing_aggregate_trigger_postgresql(element, compiler, **kw):
+    preparer = compiler.dialect.identifier_preparer
+    return 'DROP TRIGGER IF EXISTS {} ON {}'.format(
+        preparer.quote(
+            f'{element.aggregate_value.trigger_name}_{element.operation.lower()}'
+        ),
+        preparer.format_table(element.aggregate_value.trigger_table),
+    )
+
+
+class DropAggregateTrigger(DDLElement):
+    def __init__(self, aggregate_value, operation):
+        self.aggregate_value = aggregate_value
+        self.operation = operation
+
+
+@compiler.compiles(DropAggregateTrigger, 'postgresql')
+def compile_drop_aggregate_trigger_postgresql(element, compiler, **kw):
+    return 'DROP FUNCTION IF EXISTS {}() CASCADE'.format(
+        compiler.dialect.identifier_preparer.quote(
+            f'{element.aggregate_value.trigger_name}_{element.operation.lower()}'
+        )
+    )
+
+
+@compiler.compiles(DropAggregateTrigger, 'sqlite')
+def compile_drop_aggregate_trigger_sqlite(element, compiler, **kw):
+    return 'DROP TRIGGER IF EXISTS {}'.format(
+        compiler.dialect.identifier_preparer.quote(
+            f'{element.aggregate_value.trigger_name}_{element.operation.lower()}'
+        )
+    )
+
+
+def register_trigger_listeners(class_, column):
+    """
+    Create the database triggers of given aggregated column whenever the
+    metadata of given class is created, and drop them when it is dropped.
+
+    Creating the metadata again keeps a single set of triggers: SQLite skips
+    the existing ones and PostgreSQL replaces them.
+    """
+    operations = ('INSERT', 'UPDATE', 'DELETE')
+    created = []
+
+    @sa.event.listens_for(class_.metadata, 'after_create')
+    def create_triggers(target, connection, **kw):
+        aggregate_value = manager.get_aggregated_value(
+            getattr(class_, get_column_key(class_, column))
+        )
+        if not aggregate_value.trigger:
+            return
+        for operation in operations:
+            if connection.dialect.name == 'postgresql':
+                connection.execute(
+                    CreateAggregateTriggerFunction(aggregate_value, operation)
+                )
+                connection.execute(
+                    DropExistingAggregateTrigger(aggregate_value, operation)
+                )
+            connection.execute(CreateAggregateTrigger(aggregate_value, operation))
+        if aggregate_value not in created:
+            created.append(aggregate_value)
+
+    @sa.event.listens_for(class_.metadata, 'before_drop')
+    def drop_triggers(target, connection, **kw):
+        for aggregate_value in created:
+            for operation in operations:
+                connection.execute(DropAggregateTrigger(aggregate_value, operation))
+        del created[:]
+
 
 class AggregationManager:
+    #: Maximum number of values in a single IN list of an aggregate update.
+    chunk_size = 1000
+
+    #: Number of values above which the values are inserted into a temporary
+    #: table instead of being passed as IN lists. None disables this.
+    temporary_table_threshold = 10000
+
     def __init__(self):
         self.reset()
 
     def reset(self):
         self.generator_registry = defaultdict(list)
+        self.pending_values = WeakKeyDictionary()
+        self.pending_deltas = WeakKeyDictionary()
+        self.commit_depth = WeakKeyDictionary()
+        self.mapper_index = {}
 
     def register_listeners(self):
         sa.event.listen(
@@ -491,35 +1339,697 @@ class AggregationManager:
         sa.event.listen(
             sa.orm.session.Session, 'after_flush', self.construct_aggregate_queries
         )
+        sa.event.listen(sa.orm.session.Session, 'before_commit', self.begin_commit)
+        sa.event.listen(
+            sa.orm.session.Session, 'after_flush_postexec', self.flush_during_commit
+        )
+        sa.event.listen(sa.orm.session.Session, 'after_commit', self.end_commit)
+        sa.event.listen(
+            sa.orm.session.Session, 'after_soft_rollback', self.discard_aggregates
+        )
+        sa.event.listen(
+            sa.orm.session.Session, 'after_transaction_end', self.end_transaction
+        )
 
     def update_generator_registry(self):
+        # after_configured fires again whenever further mappers are
+        # configured, so skip the aggregates registered by earlier events
+        registered = {
+            (value.class_, value.attr)
+            for values in self.generator_registry.values()
+            for value in values
+        }
         for class_, attrs in aggregated_attrs.items():
-            for expr, path, column in attrs:
+            for expr, path, column, options in attrs:
+                if (class_, column) in registered:
+                    continue
+                registered.add((class_, column))
                 value = AggregatedValue(
-                    class_=class_, attr=column, path=path, expr=expr(class_)
+                    class_=class_, attr=column, path=path, expr=expr(class_), **options
                 )
+                if not value.trigger:
+                    value.cached_query('values_update_query')
+                    if value.incremental:
+                        value.delta_query()
                 key = value.relationships[0].mapper.class_
                 self.generator_registry[key].append(value)
+        self.update_mapper_index()
+
+    def update_mapper_index(self):
+        """
+        Map each mapper, including the mappers of subclasses, to the
+        aggregated values its objects affect.
+        """
+        self.mapper_index = defaultdict(list)
+        for class_, aggregate_values in self.generator_registry.items():
+            for mapper in sa.inspect(class_).self_and_descendants:
+                self.mapper_index[mapper].extend(
+                    value for value in aggregate_values if not value.trigger
+                )
+
+    def changed_states(self, session, ctx):
+        states = dict.fromkeys(ctx.states)
+        for obj in itertools.chain(session.new, session.dirty, session.deleted):
+            states[sa.inspect(obj)] = None
+        for state in states:
+            if state.obj() is not None:
+                yield state
 
     def construct_aggregate_queries(self, session, ctx):
-        object_dict = defaultdict(list)
-        for obj in session:
-            for class_ in self.generator_registry:
-                if isinstance(obj, class_):
-                    object_dict[class_].append(obj)
+        with instrumentation.measure('aggregate.flush', 'after_flush') as counter:
+            object_dict = defaultdict(list)
+            values_by_aggregate = {}
+            for state in self.changed_states(session, ctx):
+                counter.objects += 1
+                for aggregate_value in self.mapper_index.get(state.mapper, ()):
+                    if aggregate_value.is_affected_by(state, ctx):
+                        object_dict[aggregate_value].append(state.obj())
+
+            for aggregate_value, objects in object_dict.items():
+                if aggregate_value.deferred:
+                    with instrumentation.measure(
+                        'aggregate', aggregate_value.name, len(objects)
+                    ):
+                        self.defer(session, ctx, aggregate_value, objects)
+                elif aggregate_value.incremental:
+                    with instrumentation.measure(
+                        'aggregate', aggregate_value.name, len(objects)
+                    ):
+                        deltas, recompute = aggregate_value.delta_params(objects, ctx)
+                        self.apply_deltas(session, aggregate_value, deltas, recompute)
+                else:
+                    values_by_aggregate[aggregate_value] = aggregate_value.local_values(
+                        objects
+                    )
+            self.execute_update_queries(session, values_by_aggregate)
+
+    def execute_update_queries(self, session, values_by_aggregate):
+        """
+        Recompute given aggregated values for the parent rows identified by
+        their values. Aggregates with the same condition are updated with a
+        single statement. On PostgreSQL such statements are executed as
+        UPDATE ... FROM a grouped select when possible, so that the aggregated
+        table is scanned only once.
+        """
+        groups = defaultdict(dict)
+        for aggregate_value, values in values_by_aggregate.items():
+            if values:
+                groups[aggregate_value.condition_key][aggregate_value] = values
+
+        for group in groups.values():
+            first, *others = group
+            values = list(dict.fromkeys(itertools.chain.from_iterable(group.values())))
+            with instrumentation.measure(
+                'aggregate', ', '.join(value.name for value in group), len(values)
+            ):
+                self.execute_grouped_update_queries(session, first, others, values)
+
+    def execute_grouped_update_queries(self, session, first, others, values):
+        if (
+            self.temporary_table_threshold is not None
+            and len(values) > self.temporary_table_threshold
+        ):
+            connection = session.connection(
+                bind_arguments={'mapper': sa.inspect(first.class_)}
+            )
+            table = self.create_values_table(connection, first, values)
+            try:
+                self.execute_update_query(
+                    session, first, others, sa.select(table.c.value)
+                )
+            finally:
+                table.drop(connection)
+        else:
+            for chunk in chunks(values, self.chunk_size):
+                self.execute_update_query(session, first, others, chunk)
+
+    def execute_update_query(self, session, aggregate_value, others, values):
+        if isinstance(values, sa.sql.ClauseElement):
+            query = None
+            if others and self.dialect_name(session, aggregate_value) == 'postgresql':
+                query = aggregate_value.update_from_query(values, others)
+            if query is None:
+                query = aggregate_value.values_update_query(values, others)
+            session.execute(query)
+            return
+
+        query = None
+        if others and self.dialect_name(session, aggregate_value) == 'postgresql':
+            query = aggregate_value.cached_query('update_from_query', others)
+        if query is None:
+            query = aggregate_value.cached_query('values_update_query', others)
+        session.execute(query, {'aggregate_values': values})
+
+    def create_values_table(self, connection, aggregate_value, values):
+        """
+        Create a temporary table containing given values in a single column
+        named value.
+        """
+        column = local_columns(aggregate_value.relationships[0].property)[0]
+        if connection.dialect.name == 'mssql':
+            name, prefixes = '#aggregate_values', []
+        else:
+            name, prefixes = 'aggregate_values', ['TEMPORARY']
+        table = sa.Table(
+            name,
+            sa.MetaData(),
+            sa.Column('value', column.type),
+            prefixes=prefixes,
+        )
+        table.create(connection)
+        connection.execute(table.insert(), [{'value': value} for value in values])
+        return table
+
+    def get_aggregated_values(self, class_):
+        """
+        Return the :class:`AggregatedValue` objects of given class.
+
+        :param class_: Declarative class with aggregated attributes
+        """
+        sa.orm.configure_mappers()
+        aggregate_values = {}
+        for aggregate_value in itertools.chain.from_iterable(
+            self.generator_registry.values()
+        ):
+            if aggregate_value.class_ is class_:
+                aggregate_values.setdefault(aggregate_value.attr, aggregate_value)
+        return list(aggregate_values.values())
+
+    def get_aggregated_value(self, attr):
+        """
+        Return the :class:`AggregatedValue` of given aggregated attribute.
+
+        :param attr: Aggregated attribute, for example ``Thread.comment_count``
+        """
+        column = attr.property.columns[0]
+        for aggregate_value in self.get_aggregated_values(attr.class_):
+            if aggregate_value.attr is column:
+                return aggregate_value
+        raise ValueError(f'{attr} is not an aggregated attribute.')
+
+    def dialect_name(self, session, aggregate_value):
+        return session.get_bind(mapper=sa.inspect(aggregate_value.class_)).dialect.name
+
+    def apply_deltas(self, session, aggregate_value, deltas, recompute):
+        if deltas:
+            session.execute(
+                aggregate_value.delta_query(),
+                [
+                    {'aggregate_key': key, 'aggregate_delta': delta}
+                    for key, delta in deltas.items()
+                ],
+            )
+        if recompute:
+            self.execute_update_queries(session, {aggregate_value: list(recompute)})
+
+    def defer(self, session, ctx, aggregate_value, objects):
+        """
+        Collect the changes of given objects for a deferred aggregate. The
+        aggregate is updated on commit or when :func:`flush_aggregates` is
+        called.
+        """
+        values = self.pending_values.setdefault(session, defaultdict(set))
+        if aggregate_value.incremental:
+            deltas, recompute = aggregate_value.delta_params(objects, ctx)
+            pending = self.pending_deltas.setdefault(
+                session, defaultdict(lambda: defaultdict(int))
+            )[aggregate_value]
+            for key, delta in deltas.items():
+                pending[key] += delta
+            values[aggregate_value].update(recompute)
+        else:
+            values[aggregate_value].update(aggregate_value.local_values(objects))
+
+    def begin_commit(self, session):
+        self.commit_depth[session] = self.commit_depth.get(session, 0) + 1
+        self.flush_aggregates(session)
+
+    def end_commit(self, session):
+        depth = self.commit_depth.pop(session, 0) - 1
+        if depth > 0:
+            self.commit_depth[session] = depth
+
+    def flush_during_commit(self, session, ctx):
+        # Flushes made after before_commit, such as the ones of other
+        # before_commit listeners and the final flush of Session.commit(),
+        # still collect deferred changes which must be applied before the
+        # transaction is committed.
+        if self.commit_depth.get(session):
+            self.apply_pending(session)
+
+    def flush_aggregates(self, session):
+        session.flush()
+        self.apply_pending(session)
+
+    def apply_pending(self, session):
+        values = self.pending_values.pop(session, {})
+        deltas = self.pending_deltas.pop(session, {})
+        values_by_aggregate = {}
+        for aggregate_value in dict.fromkeys([*values, *deltas]):
+            pending = values.get(aggregate_value, set())
+            if aggregate_value.incremental:
+                value_deltas = {
+                    key: delta
+                    for key, delta in deltas.get(aggregate_value, {}).items()
+                    if delta and key not in pending
+                }
+                with instrumentation.measure(
+                    'aggregate',
+                    aggregate_value.name,
+                    len(value_deltas) + len(pending),
+                ):
+                    self.apply_deltas(session, aggregate_value, value_deltas, pending)
+            else:
+                values_by_aggregate[aggregate_value] = list(pending)
+        self.execute_update_queries(session, values_by_aggregate)
+
+    def prefetch(self, session):
+        """
+        Load the attributes the aggregates depend on for the changed objects
+        in given session, so that the next flush doesn't need to load them one
+        object at a time. Used by :func:`prefetch_aggregates`.
+
+        :param session: SQLAlchemy session
+        """
+        states = defaultdict(list)
+        for obj in itertools.chain(session.new, session.dirty, session.deleted):
+            state = sa.inspect(obj)
+            if state.key is None:
+                continue
+            for aggregate_value in self.mapper_index.get(state.mapper, ()):
+                prop = aggregate_value.relationships[0].property
+                keys = {get_column_key(state.mapper, local_columns(prop)[1])}
+                keys.update(aggregate_value.dependencies or ())
+                if not keys.isdisjoint(state.unloaded):
+                    states[state.mapper.base_mapper].append(state)
+                    break
+
+        with session.no_autoflush:
+            for mapper, mapper_states in states.items():
+                keys = [state.key[1] for state in mapper_states]
+                for chunk in chunks(keys, self.chunk_size):
+                    session.execute(
+                        sa.select(mapper).where(
+                            keys_condition(mapper.primary_key, chunk)
+                        )
+                    ).scalars().all()
+
+    def handle_orm_execute(self, orm_execute_state):
+        """
+        Execute given ORM-enabled INSERT, UPDATE or DELETE statement and
+        recompute the aggregates it affects. Registered as a ``do_orm_execute``
+        listener by :func:`track_bulk_aggregates`.
+        """
+        state = orm_execute_state
+        if not (state.is_insert or state.is_update or state.is_delete):
+            return
+        mapper = state.bind_mapper
+        aggregate_values = self.mapper_index.get(mapper)
+        if not aggregate_values:
+            return
+
+        session = state.session
+        columns = list(
+            dict.fromkeys(
+                local_columns(value.relationships[0].property)[1]
+                for value in aggregate_values
+            )
+        )
+        if state.is_insert:
+            result = state.invoke_statement()
+            rows = inserted_rows(state, mapper, columns)
+            if rows is None:
+                # Like UPDATE and DELETE statements without a WHERE clause,
+                # recompute the aggregates of all the parent rows.
+                rows = [
+                    tuple(row)
+                    for row in session.execute(sa.select(*columns).distinct())
+                ]
+        else:
+            keys, rows = self.affected_rows(session, state, mapper, columns)
+            result = state.invoke_statement()
+            if state.is_update:
+                rows.extend(self.fetch_rows(session, mapper, keys, columns))
+
+        values = {
+            column: {row[index] for row in rows if row[index] is not None}
+            for index, column in enumerate(columns)
+        }
+        values_by_aggregate = {}
+        for aggregate_value in aggregate_values:
+            column = local_columns(aggregate_value.relationships[0].property)[1]
+            if aggregate_value.deferred:
+                pending = self.pending_values.setdefault(session, defaultdict(set))
+                pending[aggregate_value].update(values[column])
+            else:
+                values_by_aggregate[aggregate_value] = list(values[column])
+        self.execute_update_queries(session, values_by_aggregate)
+        return result
+
+    def affected_rows(self, session, state, mapper, columns):
+        """
+        Return the primary keys of the rows given UPDATE or DELETE statement
+        is about to change along with the current values of given columns in
+        those rows.
+        """
+        if isinstance(state.parameters, list):
+            keys = [
+                tuple(
+                    parameters[get_column_key(mapper, column)]
+                    for column in mapper.primary_key
+                )
+                for parameters in state.parameters
+            ]
+            return keys, self.fetch_rows(session, mapper, keys, columns)
+
+        query = sa.select(*mapper.primary_key, *columns)
+        if state.statement.whereclause is not None:
+            query = query.where(state.statement.whereclause)
+        size = len(mapper.primary_key)
+        keys, rows = [], []
+        for row in session.execute(query):
+            keys.append(tuple(row[:size]))
+            rows.append(tuple(row[size:]))
+        return keys, rows
+
+    def fetch_rows(self, session, mapper, keys, columns):
+        rows = []
+        for chunk in chunks(keys, self.chunk_size):
+            rows.extend(
+                tuple(row)
+                for row in session.execute(
+                    sa.select(*columns).where(keys_condition(mapper.primary_key, chunk))
+                )
+            )
+        return rows
+
+    def discard_aggregates(self, session, previous_transaction):
+        if previous_transaction.nested:
+            # Deltas collected before the savepoint are still valid but can't
+            # be told apart from the rolled back ones, so recompute them all.
+            values = self.pending_values.get(session)
+            for aggregate_value, deltas in self.pending_deltas.pop(session, {}).items():
+                values[aggregate_value].update(deltas)
+        else:
+            self.pending_values.pop(session, None)
+            self.pending_deltas.pop(session, None)
 
-        for class_, objects in object_dict.items():
-            for aggregate_value in self.generator_registry[class_]:
-                query = aggregate_value.update_query(objects)
-                if query is not None:
-                    session.execute(query)
+    def end_transaction(self, session, transaction):
+        # Session.close() ends the transaction without after_soft_rollback.
+        # A commit applies all the pending changes before committing, so
+        # whatever is still pending when the root transaction ends belongs
+        # to rolled back changes.
+        if transaction.parent is None:
+            self.commit_depth.pop(session, None)
+            self.pending_values.pop(session, None)
+            self.pending_deltas.pop(session, None)
 
 
 manager = AggregationManager()
 manager.register_listeners()
 
 
-def aggregated(relationship, column):
+def flush_aggregates(session):
+    """
+    Flush given session and update all the deferred aggregates whose related
+    objects have changed during the current transaction. This is done
+    automatically before commit.
+
+    ::
+
+        from sqlalchemy_utils import flush_aggregates
+
+
+        session.add(Comment(thread=thread))
+        flush_aggregates(session)
+        session.refresh(thread)
+
+        thread.comment_count  # 1
+
+    :param session: SQLAlchemy session object
+    """
+    manager.flush_aggregates(session)
+
+
+async def prefetch_aggregates(session):
+    """
+    Load the attributes the aggregates depend on for the changed objects in
+    given :class:`~sqlalchemy.ext.asyncio.AsyncSession` ahead of flush, with
+    one query per mapper instead of one lazy load per object. See
+    :ref:`async-aggregates`.
+
+    ::
+
+        from sqlalchemy_utils import prefetch_aggregates
+
+
+        await session.delete(comment)
+        await prefetch_aggregates(session)
+        await session.commit()
+
+    :param session: AsyncSession object
+    """
+    await session.run_sync(manager.prefetch)
+
+
+def track_bulk_aggregates(target):
+    """
+    Recompute the aggregates affected by ORM-enabled INSERT, UPDATE and
+    DELETE statements executed by given target. Without this such statements
+    leave the aggregates of the affected parent rows stale.
+
+    ::
+
+        from sqlalchemy_utils import track_bulk_aggregates
+
+
+        track_bulk_aggregates(Session)
+
+        session.execute(sa.delete(Comment).where(Comment.thread_id == 1))
+
+    :param target:
+        Session object, sessionmaker or Session class whose statements are
+        tracked
+    """
+    if not sa.event.contains(target, 'do_orm_execute', manager.handle_orm_execute):
+        sa.event.listen(target, 'do_orm_execute', manager.handle_orm_execute)
+
+
+def inserted_rows(orm_execute_state, mapper, columns):
+    """
+    Return the values of given columns in the rows inserted by given
+    ORM-enabled INSERT statement, as found in its parameters, or None if the
+    statement has no parameters for them, eg. ``insert().from_select()``.
+    """
+    parameter_sets = orm_execute_state.parameters
+    if not parameter_sets:
+        parameters = orm_execute_state.statement.compile().params
+        if any(
+            get_column_key(mapper, column) not in parameters
+            and column.key not in parameters
+            for column in columns
+        ):
+            return None
+        parameter_sets = [parameters]
+    elif not isinstance(parameter_sets, list):
+        parameter_sets = [parameter_sets]
+    return [
+        tuple(
+            parameters.get(get_column_key(mapper, column), parameters.get(column.key))
+            for column in columns
+        )
+        for parameters in parameter_sets
+    ]
+
+
+def row_value(elements):
+    elements = list(elements)
+    return elements[0] if len(elements) == 1 else sa.tuple_(*elements)
+
+
+def keyset_batches(session, table, batch_size, where=None):
+    """
+    Iterate over the primary keys of given table in batches of given size.
+    Yields lists of primary key value tuples in primary key order.
+    """
+    primary_key = row_value(table.primary_key.columns)
+    query = (
+        sa.select(*table.primary_key.columns)
+        .order_by(*table.primary_key.columns)
+        .limit(batch_size)
+    )
+    if where is not None:
+        query = query.where(where)
+    last = None
+    while True:
+        batch_query = query
+        if last is not None:
+            batch_query = query.where(primary_key > row_value(last))
+        keys = session.execute(batch_query).all()
+        if not keys:
+            return
+        keys = [tuple(key) for key in keys]
+        last = keys[-1]
+        yield keys
+
+
+def recompute_aggregates(session, attr, batch_size=1000, where=None, progress=None):
+    """
+    Recompute given aggregated attribute for all the rows of its table. This
+    is useful for populating an aggregated column that was added to an
+    existing table, or for repairing values that were changed outside of the
+    ORM.
+
+    The table is processed in batches of primary key ranges, each updated
+    with a single set-based UPDATE statement and committed separately, so
+    that large tables are not updated within one long transaction.
+
+    ::
+
+        from sqlalchemy_utils import recompute_aggregates
+
+
+        recompute_aggregates(
+            session,
+            Thread.comment_count,
+            batch_size=10000,
+            where=Thread.archived.is_(False),
+            progress=lambda count: print(f'{count} threads updated')
+        )
+
+    :param session: SQLAlchemy session object
+    :param attr: Aggregated attribute, for example ``Thread.comment_count``
+    :param batch_size: Number of rows to update per batch
+    :param where: Optional SQL expression limiting the rows to update
+    :param progress:
+        Optional callable which is called with the number of rows processed
+        so far after each committed batch
+    :return: The number of rows processed
+    """
+    aggregate_value = manager.get_aggregated_value(attr)
+    table = aggregate_value.class_.__table__
+    primary_key = row_value(table.primary_key.columns)
+    count = 0
+    for keys in keyset_batches(session, table, batch_size, where):
+        query = (
+            table.update()
+            .values({aggregate_value.attr: aggregate_value.aggregate_query})
+            .where(
+                primary_key >= row_value(keys[0]), primary_key <= row_value(keys[-1])
+            )
+        )
+        if where is not None:
+            query = query.where(where)
+        result = session.execute(query)
+        session.commit()
+        count += result.rowcount
+        if progress is not None:
+            progress(count)
+    return count
+
+
+def keys_condition(columns, keys):
+    columns = list(columns)
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    return sa.tuple_(*columns).in_(keys)
+
+
+def verify_aggregates(session, model, sample=None, repair=False, batch_size=1000):
+    """
+    Compare the stored values of the aggregated attributes of given model
+    against freshly computed values and return the primary keys of the rows
+    whose values differ. This detects aggregates that have drifted because
+    related rows were changed outside of the ORM, for example with bulk
+    updates.
+
+    The table is processed in primary key batches. The stored and computed
+    values of each batch are fetched with a single query, which groups the
+    aggregated table once per batch whenever the aggregate expressions allow
+    it.
+
+    ::
+
+        from sqlalchemy_utils import verify_aggregates
+
+
+        verify_aggregates(session, Thread, sample=0.01)  # [(12, ), (5432, )]
+
+        verify_aggregates(session, Thread, repair=True)
+
+
+    :param session: SQLAlchemy session object
+    :param model: Declarative class with aggregated attributes
+    :param sample:
+        Fraction of rows of each batch to verify, for example ``0.1``. By
+        default all rows are verified.
+    :param repair:
+        If True, the aggregates of the mismatching rows are recomputed and
+        each batch is committed.
+    :param batch_size: Number of rows to process per batch
+    :return: List of primary key tuples of the mismatching rows
+    """
+    aggregate_values = manager.get_aggregated_values(model)
+    if not aggregate_values:
+        raise ValueError(f'{model} has no aggregated attributes.')
+    table = model.__table__
+    primary_key = list(table.primary_key.columns)
+
+    groups = defaultdict(list)
+    for aggregate_value in aggregate_values:
+        groups[aggregate_value.condition_key].append(aggregate_value)
+
+    mismatches = []
+    for keys in keyset_batches(session, table, batch_size):
+        if sample is not None:
+            keys = random.sample(keys, max(1, round(len(keys) * sample)))
+        condition = keys_condition(primary_key, keys)
+        from_obj = table
+        stored = []
+        computed = []
+        for index, (first, *others) in enumerate(groups.values()):
+            local = local_columns(first.relationships[0].property)[0]
+            grouped = first.grouped_query(
+                sa.select(local).where(condition), others, name=f'grouped_{index}'
+            )
+            for aggregate_value in (first, *others):
+                stored.append(aggregate_value.attr)
+                if grouped is None:
+                    computed.append(aggregate_value.aggregate_query)
+                else:
+                    computed.append(grouped.c[aggregate_value.attr.name])
+            if grouped is not None:
+                from_obj = from_obj.outerjoin(grouped, local == grouped.c.aggregate_key)
+        query = (
+            sa.select(*primary_key, *stored, *computed)
+            .select_from(from_obj)
+            .where(condition)
+            .order_by(*primary_key)
+        )
+        batch_mismatches = []
+        for row in session.execute(query):
+            key = tuple(row[: len(primary_key)])
+            values = row[len(primary_key) :]
+            if values[: len(stored)] != values[len(stored) :]:
+                batch_mismatches.append(key)
+
+        if repair and batch_mismatches:
+            session.execute(
+                table.update()
+                .values(
+                    {
+                        aggregate_value.attr: aggregate_value.aggregate_query
+                        for aggregate_value in aggregate_values
+                    }
+                )
+                .where(keys_condition(primary_key, batch_mismatches))
+            )
+            session.commit()
+        mismatches.extend(batch_mismatches)
+    return mismatches
+
+
+def aggregated(relationship, column, incremental=False, deferred=False, trigger=False):
     """
     Decorator that generates an aggregated attribute. The decorated function
     should return an aggregate select expression.
@@ -531,9 +2041,29 @@ def aggregated(relationship, column):
     :param column:
         SQLAlchemy Column object. The column definition of this aggregate
         attribute.
+    :param incremental:
+        If True, count and sum aggregates over a simple one-to-many
+        relationship are maintained by adding the change caused by each flush
+        to the stored value instead of recomputing it. Other aggregates are
+        always recomputed. See :ref:`incremental-aggregates`.
+    :param deferred:
+        If True, the aggregate is updated once before commit instead of after
+        each flush. See :ref:`deferred-aggregates`.
+    :param trigger:
+        If True, the aggregate is maintained by database triggers instead of
+        ORM event listeners. See :ref:`trigger-aggregates`.
     """
 
     def wraps(func):
-        return AggregatedAttribute(func, relationship, column)
+        return AggregatedAttribute(
+            func,
+            relationship,
+            column,
+            options={
+                'incremental': incremental,
+                'deferred': deferred,
+                'trigger': trigger,
+            },
+        )
 
     return wraps
@@ -31,6 +31,7 @@ from .orm import (  # noqa
     get_tables,
     get_type,
     getdotattr,
+    getdotattr_many,
     has_changes,
     identity,
     is_loaded,
@@ -0,0 +1,240 @@
+"""
+Instrumentation of :func:`.observer.observes` callbacks and
+:func:`.aggregates.aggregated` updates.
+
+By default nothing is measured. Assigning a sink to
+:data:`instrumentation` makes the observers and aggregates report a
+:class:`Measurement` for each observer callback invocation and each aggregate
+update, as well as one for each flush they take part in.
+
+::
+
+    from sqlalchemy_utils.instrumentation import StatsCollector, instrumentation
+
+
+    stats = StatsCollector()
+    instrumentation.sink = stats
+
+    session.commit()
+
+    stats.totals[('aggregate', 'Thread.comment_count')].duration
+
+
+A sink is any callable accepting a :class:`Measurement`. Besides
+:class:`StatsCollector`, :class:`LoggingSink` and :class:`StatsdSink` adapt
+measurements for the :mod:`logging` module and statsd style clients.
+
+Each measurement has the following fields:
+
+* ``kind``: 'observer' or 'aggregate' for a single callback or aggregate, and
+  'observer.flush' or 'aggregate.flush' for all the work done in one flush
+* ``name``: the qualified name of the callback or the name of the aggregate,
+  eg. 'Thread.comment_count'. Aggregates recomputed by a single fused
+  statement are reported together with their names separated by commas. For
+  flushes this is the name of the session event, 'before_flush' or
+  'after_flush'.
+* ``duration``: wall time in seconds
+* ``objects``: the number of objects considered. For recomputed aggregates
+  this is the number of parent rows updated.
+* ``statements``: the number of SQL statements executed
+* ``rows``: the number of rows affected by the executed INSERT, UPDATE and
+  DELETE statements
+"""
+
+import contextvars
+import logging
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+
+Measurement = namedtuple(
+    'Measurement', ['kind', 'name', 'duration', 'objects', 'statements', 'rows']
+)
+
+_counters = contextvars.ContextVar('sqlalchemy_utils_counters', default=())
+
+
+class Counter:
+    """
+    Counts of a measurement in progress. The number of objects can be
+    updated by the measured code.
+    """
+
+    __slots__ = ('objects', 'statements', 'rows')
+
+    def __init__(self, objects=0):
+        self.objects = objects
+        self.statements = 0
+        self.rows = 0
+
+
+_disabled = Counter()
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    counters = _counters.get()
+    if not counters:
+        return
+    rows = 0
+    if context is not None and (
+        context.isinsert or context.isupdate or context.isdelete
+    ):
+        rows = max(cursor.rowcount, 0)
+    for counter in counters:
+        counter.statements += 1
+        counter.rows += rows
+
+
+class Instrumentation:
+    """
+    Measures the observer callbacks and aggregate updates and passes the
+    measurements to :attr:`sink`.
+    """
+
+    def __init__(self, sink=None):
+        self._sink = None
+        self.sink = sink
+
+    @property
+    def sink(self):
+        """
+        Callable receiving each :class:`Measurement`, or None if nothing is
+        measured.
+        """
+        return self._sink
+
+    @sink.setter
+    def sink(self, sink):
+        self._sink = sink
+        if sink is not None and not sa.event.contains(
+            sa.engine.Engine, 'after_cursor_execute', count_statement
+        ):
+            sa.event.listen(sa.engine.Engine, 'after_cursor_execute', count_statement)
+
+    @contextmanager
+    def measure(self, kind, name, objects=0):
+        """
+        Measure the block of code inside this context manager, which yields
+        a :class:`Counter`. Statements executed by nested blocks are also
+        counted for the enclosing ones.
+
+        :param kind: kind of the measurement, eg. 'observer'
+        :param name: name of the measured callback or aggregate
+        :param objects: number of objects considered
+        """
+        sink = self._sink
+        if sink is None:
+            yield _disabled
+            return
+        counter = Counter(objects)
+        token = _counters.set(_counters.get() + (counter,))
+        start = time.perf_counter()
+        try:
+            yield counter
+        finally:
+            duration = time.perf_counter() - start
+            _counters.reset(token)
+            sink(
+                Measurement(
+                    kind,
+                    name,
+                    duration,
+                    counter.objects,
+                    counter.statements,
+                    counter.rows,
+                )
+            )
+
+
+instrumentation = Instrumentation()
+
+
+class Stats:
+    """
+    Totals of the measurements of a single callback or aggregate.
+    """
+
+    __slots__ = ('calls', 'duration', 'objects', 'statements', 'rows')
+
+    def __init__(self):
+        self.calls = 0
+        self.duration = 0.0
+        self.objects = 0
+        self.statements = 0
+        self.rows = 0
+
+    def __repr__(self):
+        return (
+            f'<Stats calls={self.calls} duration={self.duration:.6f} '
+            f'objects={self.objects} statements={self.statements} '
+            f'rows={self.rows}>'
+        )
+
+
+class StatsCollector:
+    """
+    Sink summing up the measurements per kind and name. The totals are
+    available in :attr:`totals`, a dictionary of :class:`Stats` keyed by
+    ``(kind, name)`` tuples.
+    """
+
+    def __init__(self):
+        self.totals = {}
+
+    def __call__(self, measurement):
+        try:
+            stats = self.totals[measurement.kind, measurement.name]
+        except KeyError:
+            stats = self.totals[measurement.kind, measurement.name] = Stats()
+        stats.calls += 1
+        stats.duration += measurement.duration
+        stats.objects += measurement.objects
+        stats.statements += measurement.statements
+        stats.rows += measurement.rows
+
+    def reset(self):
+        self.totals = {}
+
+
+class LoggingSink:
+    """
+    Sink logging each measurement with given logger.
+
+    :param logger: Logger object, by default 'sqlalchemy_utils.instrumentation'
+    :param level: Logging level of the messages
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, measurement):
+        self.logger.log(
+            self.level,
+            '%s %s: %.6fs, %d objects, %d statements, %d rows',
+            *measurement,
+        )
+
+
+class StatsdSink:
+    """
+    Sink reporting each measurement to a statsd style client, which provides
+    ``incr(stat, count)`` and ``timing(stat, milliseconds)`` methods.
+
+    :param client: statsd client
+    :param prefix: Prefix of the reported stat names
+    """
+
+    def __init__(self, client, prefix='sqlalchemy_utils'):
+        self.client = client
+        self.prefix = prefix
+
+    def __call__(self, measurement):
+        stat = f'{self.prefix}.{measurement.kind}.{measurement.name}'
+        self.client.incr(f'{stat}.calls', 1)
+        self.client.timing(f'{stat}.duration', measurement.duration * 1000)
+        self.client.incr(f'{stat}.objects', measurement.objects)
+        self.client.incr(f'{stat}.statements', measurement.statements)
+        self.client.incr(f'{stat}.rows', measurement.rows)
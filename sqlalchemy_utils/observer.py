@@ -170,32 +170,138 @@ in the decorator.
             self.total_price = amount * unit_price
 
 
+.. _deferred-observers:
+
+Deferring observers to commit
+-----------------------------
+
+Observers are normally invoked at every flush. Code that flushes many times
+within a single transaction therefore invokes the same observers for the same
+objects over and over again. Passing ``when='commit'`` collects the affected
+objects from each flush and invokes the observer only once per object, right
+before the transaction is committed.
+
+::
+
+    class Catalog(Base):
+        # same as before..
+
+        @observes('categories.products', when='commit')
+        def product_observer(self, products):
+            self.product_count = len(products)
+
+
+The observer receives the objects of the observed paths as they are at commit
+time. Until then the observed values may be stale.
+
+
+Bulk operations
+---------------
+
+ORM-enabled INSERT, UPDATE and DELETE statements executed with
+``session.execute()`` bypass the unit of work, so observers are not notified
+of the rows they change. :func:`track_bulk_observers` makes the given session,
+sessionmaker or Session class load the rows changed by such statements and
+invoke the observers of the affected root objects before commit.
+
+::
+
+    from sqlalchemy_utils import track_bulk_observers
+
+
+    track_bulk_observers(session)
+
+    session.execute(
+        sa.insert(Product),
+        [{'category_id': 1, 'price': 10}, {'category_id': 2, 'price': 20}]
+    )
+    session.commit()
+
+
+The legacy ``Session.bulk_*`` methods don't emit any session events and
+therefore aren't supported. Use the equivalent ORM-enabled statements
+instead.
+
+
+.. _async-observers:
+
+Async sessions
+--------------
+
+Observers work with :class:`~sqlalchemy.ext.asyncio.AsyncSession` as well,
+since its flushes run the event listeners of the underlying synchronous
+session. Every query issued by an observer during the flush, including lazy
+loads of the observed paths, is however an additional round trip through the
+event loop. Awaiting :func:`prefetch_observed` right before flushing or
+committing loads all the observed paths of the changed objects with one query
+per relationship hop beforehand.
+
+::
+
+    from sqlalchemy_utils import prefetch_observed
+
+
+    async with AsyncSession(engine) as session:
+        product = await session.get(Product, 1)
+        product.price = 10
+        await prefetch_observed(session)
+        await session.commit()
+
+
+Observers should only access the objects passed to them. Accessing other
+unloaded relationships inside an observer triggers lazy loads, which are
+only possible because the flush runs in a greenlet.
 
 """
 
+import functools
 import itertools
 from collections import defaultdict, namedtuple
 from collections.abc import Iterable
+from weakref import WeakKeyDictionary, WeakSet
 
 import sqlalchemy as sa
 
 from .functions import getdotattr, has_changes
-from .path import AttrPath
-from .utils import is_sequence
+from .functions.orm import load_attribute
+from .instrumentation import instrumentation
+from .path import get_attr_path
+from .utils import chunks, is_sequence
+
+
+def is_deleted(session, obj):
+    """
+    Return whether given object is marked for deletion in given session or has
+    already been deleted by one of its flushes.
+    """
+    if obj in session.deleted:
+        return True
+    state = sa.inspect(obj, raiseerr=False)
+    return isinstance(state, sa.orm.InstanceState) and state.deleted
+
 
-Callback = namedtuple('Callback', ['func', 'backref', 'fullpath'])
+def count_objects(args):
+    return sum(len(arg) if is_sequence(arg) else int(arg is not None) for arg in args)
+
+
+Callback = namedtuple('Callback', ['func', 'backref', 'fullpath', 'keys'])
 
 
 class PropertyObserver:
+    chunk_size = 1000
+
     def __init__(self):
         self.listener_args = [
             (sa.orm.Mapper, 'mapper_configured', self.update_generator_registry),
             (sa.orm.Mapper, 'after_configured', self.gather_paths),
             (sa.orm.session.Session, 'before_flush', self.invoke_callbacks),
+            (sa.orm.session.Session, 'before_commit', self.flush_callbacks),
+            (sa.orm.session.Session, 'after_soft_rollback', self.discard_callbacks),
         ]
-        self.callback_map = defaultdict(list)
-        # TODO: make the registry a WeakKey dict
-        self.generator_registry = defaultdict(list)
+        self.pending_roots = WeakKeyDictionary()
+        self.flushing_sessions = WeakSet()
+        self.indexed_mappers = WeakSet()
+        self.generator_registry = WeakKeyDictionary()
 
     def remove_listeners(self):
         for args in self.listener_args:
@@ -214,20 +320,52 @@ class PropertyObserver:
         Adds generator functions to generator_registry.
         """
 
+        self.clear_mapper_index()
         for generator in class_.__dict__.values():
             if hasattr(generator, '__observes__'):
-                self.generator_registry[class_].append(generator)
+                self.generator_registry.setdefault(class_, []).append(generator)
+
+    def unregister(self, registry):
+        """
+        Remove the observers of all the classes mapped by given registry or
+        declarative base.
+
+        :param registry: :class:`sqlalchemy.orm.registry` or declarative base
+        """
+        registry = getattr(registry, 'registry', registry)
+        for mapper in registry.mappers:
+            self.generator_registry.pop(mapper.class_, None)
+        self.gather_paths()
+
+    @property
+    def callback_map(self):
+        """
+        Dictionary of the callbacks registered for each observed class.
+        """
+        return {
+            mapper.class_: mapper.class_manager.info[self]['callbacks']
+            for mapper in self.indexed_mappers
+            if 'callbacks' in mapper.class_manager.info[self]
+        }
 
     def gather_paths(self):
-        for class_, generators in self.generator_registry.items():
+        callback_map = defaultdict(list)
+        for class_, generators in list(self.generator_registry.items()):
+            if sa.inspect(class_, raiseerr=False) is None:
+                continue
             for callback in generators:
                 full_paths = []
                 for call_path in callback.__observes__:
-                    full_paths.append(AttrPath(class_, call_path))
+                    full_paths.append(get_attr_path(class_, call_path))
 
                 for path in full_paths:
-                    self.callback_map[class_].append(
-                        Callback(func=callback, backref=None, fullpath=full_paths)
+                    callback_map[class_].append(
+                        Callback(
+                            func=callback,
+                            backref=None,
+                            fullpath=full_paths,
+                            keys=self.get_observed_keys(path, 0),
+                        )
                     )
 
                     for index in range(len(path)):
@@ -235,72 +373,524 @@ class PropertyObserver:
                         prop = path[index].property
                         if isinstance(prop, sa.orm.RelationshipProperty):
                             prop_class = path[index].property.mapper.class_
-                            self.callback_map[prop_class].append(
+                            backref = ~(path[:i])
+                            callback_map[prop_class].append(
                                 Callback(
                                     func=callback,
-                                    backref=~(path[:i]),
+                                    backref=backref,
                                     fullpath=full_paths,
+                                    keys=self.get_observed_keys(path, i, backref),
                                 )
                             )
+        self.update_mapper_index(callback_map)
 
-    def gather_callback_args(self, obj, callbacks):
-        session = sa.orm.object_session(obj)
-        for callback in callbacks:
-            backref = callback.backref
-
-            root_objs = getdotattr(obj, backref) if backref else obj
-            if root_objs:
-                if not isinstance(root_objs, Iterable):
-                    root_objs = [root_objs]
+    def get_observed_keys(self, path, index, backref=None):
+        """
+        Return the attribute keys whose changes, on an object found at given
+        position of given path, can affect the observed values. Returns None
+        if the object itself is the observed value, in which case any change
+        counts.
+
+        :param path: observed :class:`.path.AttrPath`
+        :param index: number of path parts leading to the object
+        :param backref: inverted path leading from the object back to the
+            observing object
+        """
+        if index == len(path):
+            return None
+        props = [path[index].property]
+        if backref is not None:
+            props.append(backref[0].property)
+
+        keys = set()
+        for prop in props:
+            keys.add(prop.key)
+            if isinstance(prop, sa.orm.RelationshipProperty):
+                for column in prop.local_columns:
+                    try:
+                        keys.add(prop.parent.get_property_by_column(column).key)
+                    except sa.orm.exc.UnmappedColumnError:
+                        pass
+        return frozenset(keys)
+
+    def is_triggered_by(self, session, obj, callback):
+        if callback.keys is None:
+            return True
+        state = sa.inspect(obj)
+        if state.key is None or obj in session.deleted:
+            return True
+        return any(state.attrs[key].history.has_changes() for key in callback.keys)
+
+    def update_mapper_index(self, callback_map):
+        """
+        Store the callbacks of each observed class and precompute the
+        flattened callback list of each observed mapper and its descendants so
+        that flush time dispatch is a single dict lookup per object.
 
-                with session.no_autoflush:
-                    for root_obj in root_objs:
-                        if root_obj:
-                            args = self.get_callback_args(root_obj, callback)
-                            if args:
-                                yield args
+        The callbacks reference the observed classes, so they are kept in the
+        ``info`` dictionaries of their class managers instead of this observer. This
+        way the observer does not keep otherwise unused classes alive.
+        """
+        self.clear_mapper_index()
+        for class_, callbacks in callback_map.items():
+            mapper = sa.inspect(class_, raiseerr=False)
+            if mapper is not None:
+                self.get_mapper_info(mapper)['callbacks'] = callbacks
+        for mapper in list(self.indexed_mappers):
+            for submapper in mapper.self_and_descendants:
+                self.get_mapper_callbacks(submapper)
+
+    def clear_mapper_index(self):
+        for mapper in self.indexed_mappers:
+            mapper.class_manager.info.pop(self, None)
+        self.indexed_mappers = WeakSet()
+
+    def get_mapper_info(self, mapper):
+        try:
+            return mapper.class_manager.info[self]
+        except KeyError:
+            self.indexed_mappers.add(mapper)
+            info = mapper.class_manager.info[self] = {}
+            return info
+
+    def get_mapper_callbacks(self, mapper):
+        info = self.get_mapper_info(mapper)
+        try:
+            return info['dispatch']
+        except KeyError:
+            callbacks = info['dispatch'] = [
+                callback
+                for base in reversed(list(mapper.iterate_to_root()))
+                for callback in base.class_manager.info.get(self, {}).get(
+                    'callbacks', ()
+                )
+            ]
+            return callbacks
+
+    def get_root_objects(self, objects, callback):
+        backref = callback.backref
+        if not backref:
+            return objects
+
+        root_objs = []
+        for obj in objects:
+            value = getdotattr(obj, backref)
+            if not value:
+                continue
+            if not isinstance(value, Iterable):
+                value = [value]
+            root_objs.extend(root_obj for root_obj in value if root_obj)
+        return root_objs
+
+    def is_root_changed(self, root_obj, callback):
+        return any(
+            len(path) > 1 or has_changes(root_obj, path.path.path)
+            for path in callback.fullpath
+        )
 
-    def get_callback_args(self, root_obj, callback):
+    def get_callback_objects(self, root_obj, callback):
         session = sa.orm.object_session(root_obj)
-        objects = [
-            getdotattr(root_obj, path, lambda obj: obj not in session.deleted)
+        return [
+            getdotattr(root_obj, path, lambda obj: not is_deleted(session, obj))
             for path in callback.fullpath
         ]
-        paths = [str(path) for path in callback.fullpath]
-        for path in paths:
-            if '.' in path or has_changes(root_obj, path):
-                return (root_obj, callback.func, objects)
+
+    def get_callback_args(self, root_obj, callback):
+        if self.is_root_changed(root_obj, callback):
+            return (
+                root_obj,
+                callback.func,
+                self.get_callback_objects(root_obj, callback),
+            )
 
     def iterate_objects_and_callbacks(self, session):
         objs = itertools.chain(session.new, session.dirty, session.deleted)
         for obj in objs:
-            for class_, callbacks in self.callback_map.items():
-                if isinstance(obj, class_):
-                    yield obj, callbacks
+            callbacks = self.get_mapper_callbacks(sa.inspect(obj).mapper)
+            if callbacks:
+                yield obj, callbacks
+
+    def group_objects_by_callback(self, session):
+        groups = {}
+        for obj, callbacks in self.iterate_objects_and_callbacks(session):
+            for callback in callbacks:
+                if self.is_triggered_by(session, obj, callback):
+                    groups.setdefault(id(callback), (callback, []))[1].append(obj)
+        return groups.values()
+
+    def iterate_root_objects(self, session):
+        """
+        Yield each callback along with the root objects affected by the
+        changed objects in given session.
+
+        Objects are grouped per callback so that every relationship hop of
+        the backref path is loaded for the whole group at once (see
+        :meth:`preload_path`).
+        """
+        for callback, objects in self.group_objects_by_callback(session):
+            if callback.backref:
+                self.preload_path(session, objects, callback.backref)
+            root_objs = self.get_root_objects(objects, callback)
+            yield callback, list({id(obj): obj for obj in root_objs}.values())
+
+    def iterate_callback_args(self, session, root_objects):
+        for callback, root_objs in root_objects:
+            for path in callback.fullpath:
+                self.preload_path(session, root_objs, path)
+            for root_obj in root_objs:
+                args = self.get_callback_args(root_obj, callback)
+                if args:
+                    yield args
+
+    def preload_path(self, session, objects, path):
+        """
+        Load every relationship hop of given path for all given objects using
+        one ``IN`` query per hop and chunk of objects instead of lazy loading
+        the relationship one object at a time.
+
+        :param session: SQLAlchemy session
+        :param objects: objects the path starts from
+        :param path: :class:`.path.AttrPath` to load
+        """
+        for attr in path:
+            if not objects:
+                break
+            objects = self.preload_relationship(session, objects, attr.key)
+
+    def preload_relationship(self, session, objects, key):
+        """
+        Load given attribute for all given objects which don't have it loaded
+        and return the distinct objects it refers to. Column attributes are
+        loaded as well, in which case there are no objects to return.
+        """
+        return load_attribute(objects, key, self.chunk_size)
+
+    def prefetch(self, session):
+        """
+        Load the observed paths of the changed objects in given session, so
+        that the next flush doesn't need to load them one object at a time.
+        Used by :func:`prefetch_observed`.
+
+        :param session: SQLAlchemy session
+        """
+        with session.no_autoflush:
+            for callback, root_objs in self.iterate_root_objects(session):
+                for path in callback.fullpath:
+                    self.preload_path(session, root_objs, path)
 
     def invoke_callbacks(self, session, ctx, instances):
+        root_objects = []
+        with instrumentation.measure('observer.flush', 'before_flush') as counter:
+            if instrumentation.sink is not None:
+                # Session.dirty walks the whole identity map, so only count
+                # the objects when they are reported.
+                counter.objects = (
+                    len(session.new) + len(session.dirty) + len(session.deleted)
+                )
+            with session.no_autoflush:
+                for callback, root_objs in self.iterate_root_objects(session):
+                    if getattr(callback.func, '__observes_when__', 'flush') == 'flush':
+                        root_objects.append((callback, root_objs))
+                    elif session not in self.flushing_sessions:
+                        self.defer(session, callback, root_objs)
+                self.run_callbacks(self.iterate_callback_args(session, root_objects))
+
+    def defer(self, session, callback, root_objs):
+        """
+        Collect the root objects of a callback observing with
+        ``when='commit'``. The callback is invoked once per root object right
+        before the transaction is committed.
+        """
+        self.schedule(
+            session,
+            callback,
+            [
+                root_obj
+                for root_obj in root_objs
+                if self.is_root_changed(root_obj, callback)
+            ],
+        )
+
+    def schedule(self, session, callback, root_objs):
+        pending = self.pending_roots.setdefault(session, {})
+        _, roots = pending.setdefault(callback.func, (callback, {}))
+        for root_obj in root_objs:
+            roots[id(root_obj)] = root_obj
+
+    def handle_orm_execute(self, orm_execute_state):
+        """
+        Execute given ORM-enabled INSERT, UPDATE or DELETE statement and
+        schedule the callbacks observing the rows it changes to be invoked
+        before commit. Registered as a ``do_orm_execute`` listener by
+        :func:`track_bulk_observers`.
+        """
+        state = orm_execute_state
+        mapper = state.bind_mapper
+        if mapper is None or not (
+            state.is_insert or state.is_update or state.is_delete
+        ):
+            return
+        callbacks = self.get_mapper_callbacks(mapper)
+        if not callbacks:
+            return
+
+        session = state.session
+        root_objects = []
+        if state.is_insert:
+            result = state.invoke_statement()
+            with session.no_autoflush:
+                root_objects.extend(self.inserted_root_objects(state, callbacks))
+        else:
+            keys = self.affected_keys(state)
+            with session.no_autoflush:
+                objects = self.load_objects(session, mapper, keys)
+                root_objects.extend(self.bulk_root_objects(session, objects, callbacks))
+            result = state.invoke_statement()
+            if state.is_update:
+                with session.no_autoflush:
+                    objects = self.load_objects(session, mapper, keys, True)
+                    root_objects.extend(
+                        self.bulk_root_objects(session, objects, callbacks)
+                    )
+
+        for callback, root_objs in root_objects:
+            self.schedule(session, callback, root_objs)
+        return result
+
+    def affected_keys(self, orm_execute_state):
+        """
+        Return the primary keys of the rows given UPDATE or DELETE statement
+        is about to change.
+        """
+        state = orm_execute_state
+        mapper = state.bind_mapper
+        if isinstance(state.parameters, list):
+            return [
+                tuple(
+                    parameters[mapper.get_property_by_column(column).key]
+                    for column in mapper.primary_key
+                )
+                for parameters in state.parameters
+            ]
+        query = sa.select(*mapper.primary_key)
+        if state.statement.whereclause is not None:
+            query = query.where(state.statement.whereclause)
+        return [tuple(row) for row in state.session.execute(query)]
+
+    def load_objects(
+        self, session, mapper, keys, populate_existing=False, columns=None
+    ):
+        """
+        Load the objects of given mapper whose given columns, the primary key
+        by default, have any of given values.
+        """
+        objects = []
+        columns = list(mapper.primary_key if columns is None else columns)
+        for chunk in chunks(keys, self.chunk_size):
+            if len(columns) == 1:
+                condition = columns[0].in_([key[0] for key in chunk])
+            else:
+                condition = sa.tuple_(*columns).in_(chunk)
+            objects.extend(
+                session.execute(
+                    sa.select(mapper)
+                    .where(condition)
+                    .execution_options(populate_existing=populate_existing)
+                ).scalars()
+            )
+        return objects
+
+    def bulk_root_objects(self, session, objects, callbacks, start=0):
+        """
+        Yield each of given callbacks along with its root objects affected by
+        given objects, which were changed by a bulk statement. Bulk statements
+        don't update the relationships of the objects in the session, so the
+        relationships leading from the root objects to given objects are
+        expired along the way.
+        """
+        for callback in callbacks:
+            if not callback.backref:
+                yield callback, objects
+                continue
+            forward = list(~callback.backref)
+            related = objects
+            for index, part in enumerate(callback.backref):
+                if index < start:
+                    continue
+                related = self.preload_relationship(session, related, part.key)
+                for obj in related:
+                    session.expire(obj, [forward[-1 - index].key])
+            yield callback, related
+
+    def inserted_root_objects(self, orm_execute_state, callbacks):
+        """
+        Yield each of given callbacks along with its root objects affected by
+        the rows inserted by given ORM-enabled INSERT statement. The inserted
+        rows are loaded if the statement parameters include their primary
+        keys. Otherwise the root objects are found through the many-to-one
+        relationships of the inserted rows, whose foreign keys are read from
+        the statement parameters.
+        """
+        state = orm_execute_state
+        session = state.session
+        mapper = state.bind_mapper
+        parameter_sets = state.parameters
+        if not parameter_sets:
+            parameter_sets = [state.statement.compile().params]
+        elif not isinstance(parameter_sets, list):
+            parameter_sets = [parameter_sets]
+
+        def get_values(parameters, columns):
+            values = []
+            for column in columns:
+                key = mapper.get_property_by_column(column).key
+                values.append(parameters.get(key, parameters.get(column.key)))
+            return tuple(values)
+
+        keys = [
+            get_values(parameters, mapper.primary_key) for parameters in parameter_sets
+        ]
+        if all(None not in key for key in keys):
+            objects = self.load_objects(session, mapper, keys)
+            yield from self.bulk_root_objects(session, objects, callbacks)
+            return
+
+        for callback in callbacks:
+            if not callback.backref:
+                continue
+            prop = callback.backref[0].property
+            if prop.direction is not sa.orm.interfaces.MANYTOONE:
+                continue
+            local, remote = zip(*prop.local_remote_pairs)
+            values = {get_values(parameters, local) for parameters in parameter_sets}
+            values = [value for value in values if None not in value]
+            if not values:
+                continue
+            parents = self.load_objects(session, prop.mapper, values, columns=remote)
+            for parent in parents:
+                session.expire(parent, [(~callback.backref)[-1].key])
+            yield from self.bulk_root_objects(session, parents, [callback], start=1)
+
+    def flush_callbacks(self, session):
+        session.flush()
+        pending = self.pending_roots.pop(session, {})
+        if not pending:
+            return
+
+        callback_args = []
+        with session.no_autoflush:
+            for callback, roots in pending.values():
+                root_objs = [
+                    root_obj
+                    for root_obj in roots.values()
+                    if sa.inspect(root_obj).persistent and root_obj in session
+                ]
+                for path in callback.fullpath:
+                    self.preload_path(session, root_objs, path)
+                callback_args.extend(
+                    (
+                        root_obj,
+                        callback.func,
+                        self.get_callback_objects(root_obj, callback),
+                    )
+                    for root_obj in root_objs
+                )
+            self.run_callbacks(callback_args)
+
+        # Flush the changes made by the callbacks right away so that they
+        # are not collected for the next commit again.
+        self.flushing_sessions.add(session)
+        try:
+            session.flush()
+        finally:
+            self.flushing_sessions.discard(session)
+
+    def discard_callbacks(self, session, previous_transaction):
+        if not previous_transaction.nested:
+            self.pending_roots.pop(session, None)
+
+    def run_callbacks(self, args):
         callback_args = defaultdict(lambda: defaultdict(set))
-        for obj, callbacks in self.iterate_objects_and_callbacks(session):
-            args = self.gather_callback_args(obj, callbacks)
-            for root_obj, func, objects in args:
-                if not callback_args[root_obj][func]:
-                    callback_args[root_obj][func] = {}
-                for i, object_ in enumerate(objects):
-                    if is_sequence(object_):
-                        callback_args[root_obj][func][i] = callback_args[root_obj][
-                            func
-                        ].get(i, set()) | set(object_)
-                    else:
-                        callback_args[root_obj][func][i] = object_
+        for root_obj, func, objects in args:
+            if not callback_args[root_obj][func]:
+                callback_args[root_obj][func] = {}
+            for i, object_ in enumerate(objects):
+                if is_sequence(object_):
+                    callback_args[root_obj][func][i] = callback_args[root_obj][
+                        func
+                    ].get(i, set()) | set(object_)
+                else:
+                    callback_args[root_obj][func][i] = object_
 
         for root_obj, callback_objs in callback_args.items():
             for callback, objs in callback_objs.items():
-                callback(root_obj, *[objs[i] for i in range(len(objs))])
+                args = [objs[i] for i in range(len(objs))]
+                with instrumentation.measure(
+                    'observer', callback.__qualname__, count_objects(args)
+                ):
+                    callback(root_obj, *args)
 
 
 observer = PropertyObserver()
 
 
+async def prefetch_observed(session, **observer_kw):
+    """
+    Load the observed paths of the changed objects in given
+    :class:`~sqlalchemy.ext.asyncio.AsyncSession` ahead of flush. The paths
+    are loaded with one query per relationship hop, so that the observers
+    invoked by the next flush work on already loaded objects. See
+    :ref:`async-observers`.
+
+    ::
+
+        from sqlalchemy_utils import prefetch_observed
+
+
+        product.price = 10
+        await prefetch_observed(session)
+        await session.commit()
+
+    :param session: AsyncSession object
+    :param observer_kw: A dictionary where value for key 'observer' contains
+       :meth:`PropertyObserver` object
+    """
+    observer_ = observer_kw.pop('observer', observer)
+    await session.run_sync(observer_.prefetch)
+
+
+def track_bulk_observers(target, **observer_kw):
+    """
+    Invoke the observers of the rows changed by ORM-enabled INSERT, UPDATE
+    and DELETE statements executed by given target. Such statements bypass
+    the unit of work, so without this the observers are not notified of their
+    changes. The affected root objects are collected and their observers are
+    invoked once per root object right before the transaction is committed,
+    regardless of the ``when`` option of the observer.
+
+    ::
+
+        from sqlalchemy_utils import track_bulk_observers
+
+
+        track_bulk_observers(session)
+
+        session.execute(
+            sa.update(Product).where(Product.price < 10).values(price=10)
+        )
+        session.commit()
+
+    :param target:
+        Session object, sessionmaker or Session class whose statements are
+        tracked
+    :param observer_kw: A dictionary where value for key 'observer' contains
+       :meth:`PropertyObserver` object
+    """
+    observer_ = observer_kw.pop('observer', observer)
+    if not sa.event.contains(target, 'do_orm_execute', observer_.handle_orm_execute):
+        sa.event.listen(target, 'do_orm_execute', observer_.handle_orm_execute)
+
+
 def observes(*paths, **observer_kw):
     """
     Mark method as property observer for the given property path. Inside
@@ -340,16 +930,22 @@ def observes(*paths, **observer_kw):
     :param paths: One or more dot-notated property paths, eg.
        'categories.products.price'
     :param observer_kw: A dictionary where value for key 'observer' contains
-       :meth:`PropertyObserver` object
+       :meth:`PropertyObserver` object and value for key 'when' is either
+       'flush' (default) or 'commit'. See :ref:`deferred-observers`.
     """
     observer_ = observer_kw.pop('observer', observer)
+    when = observer_kw.pop('when', 'flush')
+    if when not in ('flush', 'commit'):
+        raise ValueError(f"Unknown value for 'when': {when!r}")
     observer_.register_listeners()
 
     def wraps(func):
+        @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             return func(self, *args, **kwargs)
 
         wrapper.__observes__ = paths
+        wrapper.__observes_when__ = when
         return wrapper
 
     return wraps
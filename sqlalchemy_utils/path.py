@@ -58,6 +58,7 @@ class AttrPath:
     def __init__(self, class_, path):
         self.class_ = class_
         self.path = Path(path)
+        self._inverse = None
         self.parts = []
         last_attr = class_
         for value in self.path:
@@ -68,6 +69,11 @@ class AttrPath:
         yield from self.parts
 
     def __invert__(self):
+        if self._inverse is None:
+            self._inverse = self.invert()
+        return self._inverse
+
+    def invert(self):
         def get_backref(part):
             prop = part.property
             backref = prop.backref or prop.back_populates
@@ -86,7 +92,7 @@ class AttrPath:
         else:
             class_ = self.parts[-1].mapper.class_
 
-        return self.__class__(class_, '.'.join(map(get_backref, reversed(self.parts))))
+        return get_attr_path(class_, '.'.join(map(get_backref, reversed(self.parts))))
 
     def index(self, element):
         for index, el in enumerate(self.parts):
@@ -113,12 +119,12 @@ class AttrPath:
                 class_ = self.class_
             else:
                 class_ = result[0].parent.class_
-            return self.__class__(class_, self.path[slice])
+            return get_attr_path(class_, self.path[slice].path)
         else:
             return result
 
     def __len__(self):
-        return len(self.path)
+        return len(self.parts)
 
     def __repr__(self):
         return '{}({}, {!r})'.format(
@@ -133,3 +139,32 @@ class AttrPath:
 
     def __unicode__(self):
         return str(self.path)
+
+
+def get_attr_path(class_, path):
+    """
+    Return :class:`AttrPath` for given class and dot separated path.
+
+    The resolved paths are cached in the class manager of given class, so
+    that each path is resolved only once per class and the same
+    :class:`AttrPath` object, along with its cached inverse, is returned on
+    subsequent calls. The returned object is shared and should not be
+    modified.
+
+    ::
+
+        get_attr_path(SubSection, 'section.document')
+
+    :param class_: Mapped class
+    :param path: Attribute path with dot mark as separator
+    """
+    mapper = sa.inspect(class_, raiseerr=False)
+    if mapper is None:
+        return AttrPath(class_, path)
+    paths = mapper.class_manager.info.setdefault('sqlalchemy_utils.attr_paths', {})
+    path = str(path)
+    try:
+        return paths[path]
+    except KeyError:
+        attr_path = paths[path] = AttrPath(class_, path)
+        return attr_path
@@ -2,16 +2,12 @@ import sqlalchemy as sa
 import sqlalchemy.orm
 from sqlalchemy.sql.util import ClauseAdapter
 
+from ..path import get_attr_path
 from .chained_join import chained_join  # noqa
 
 
 def path_to_relationships(path, cls):
-    relationships = []
-    for path_name in path.split('.'):
-        rel = getattr(cls, path_name)
-        relationships.append(rel)
-        cls = rel.mapper.class_
-    return relationships
+    return list(get_attr_path(cls, path))
 
 
 def adapt_expr(expr, *selectables):
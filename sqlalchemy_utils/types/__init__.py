@@ -10,6 +10,8 @@ from .currency import CurrencyType  # noqa
 from .email import EmailType  # noqa
 from .encrypted.encrypted_type import (  # noqa
     EncryptedType,
+    Keyring,
+    reencrypt_column,
     StringEncryptedType,
 )
 from .enriched_datetime.enriched_date_type import EnrichedDateType  # noqa
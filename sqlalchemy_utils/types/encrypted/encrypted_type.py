@@ -1,15 +1,26 @@
 import base64
+import copy
 import datetime
+import hashlib
+import hmac
+import itertools
 import json
 import os
+import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+import sqlalchemy as sa
+import sqlalchemy.orm
+from sqlalchemy.sql import operators
 from sqlalchemy.types import LargeBinary, String, TypeDecorator
 
 from sqlalchemy_utils.exceptions import ImproperlyConfigured
 from sqlalchemy_utils.types.encrypted.padding import PADDING_MECHANISM
 from sqlalchemy_utils.types.json import JSONType
 from sqlalchemy_utils.types.scalar_coercible import ScalarCoercible
+from sqlalchemy_utils.utils import chunks
 
 cryptography = None
 try:
@@ -34,21 +45,123 @@ class InvalidCiphertextError(Exception):
     pass
 
 
+class Keyring:
+    """
+    Set of keys for :class:`StringEncryptedType`, each identified by a key
+    id. New values are encrypted with the active key, and the id of the key
+    is stored in front of each ciphertext, separated by a colon. Stored
+    values are decrypted with the key their id refers to, so values
+    encrypted with retired keys remain readable while they are re-encrypted
+    with the active key, for example with :func:`reencrypt_column`.
+
+    ::
+
+        keyring = Keyring({'2023': old_key, '2024': new_key}, active='2024')
+
+        class User(Base):
+            __tablename__ = 'user'
+            id = sa.Column(sa.Integer, primary_key=True)
+            username = sa.Column(StringEncryptedType(sa.Unicode, keyring))
+
+    Searching by the value of a column using :class:`AesEngine` only finds
+    the rows encrypted with the active key.
+
+    :param keys: Dictionary of key ids and keys, or callables returning
+        the keys. Key ids must not contain colons.
+    :param active: Id of the key new values are encrypted with
+    :param untagged: Optional id of the key values stored without a key id
+        are encrypted with. This allows switching an existing column to a
+        keyring.
+    """
+
+    separator = ':'
+
+    def __init__(self, keys, active, untagged=None):
+        for key_id in keys:
+            if self.separator in key_id:
+                raise ImproperlyConfigured(
+                    f'Key id {key_id!r} must not contain {self.separator!r}.'
+                )
+        self.keys = keys
+        self.active = active
+        self.untagged = untagged
+
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, value):
+        if value not in self.keys:
+            raise ImproperlyConfigured(f'Unknown active key id {value!r}.')
+        self._active = value
+
+    def split(self, value):
+        """
+        Return the key id and the ciphertext of given stored value.
+        """
+        key_id, separator, ciphertext = value.partition(self.separator)
+        if separator:
+            return key_id, ciphertext
+        if self.untagged is None:
+            raise InvalidCiphertextError('Ciphertext has no key id.')
+        return self.untagged, value
+
+
 class EncryptionDecryptionBaseEngine:
     """A base encryption and decryption engine.
 
     This class must be sub-classed in order to create
     new engines.
+
+    The attributes set by ``_initialize_engine`` are cached for the
+    ``key_cache_size`` most recently used keys, so that the key is hashed
+    and the cipher objects are created only once per key instead of once
+    per value.
     """
 
+    key_cache_size = 32
+
     def _update_key(self, key):
         if isinstance(key, str):
             key = key.encode()
+        if key == self.__dict__.get('_current_key'):
+            return
+        try:
+            cache = self._key_cache
+        except AttributeError:
+            cache = self._key_cache = OrderedDict()
+        try:
+            state = cache[key]
+        except KeyError:
+            state = cache[key] = self._derive_engine_state(key)
+            if len(cache) > self.key_cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+            self.__dict__.update(state)
+        self._current_key = key
+
+    def _derive_engine_state(self, key):
+        try:
+            static_attributes = self._static_attributes
+        except AttributeError:
+            static_attributes = self._static_attributes = frozenset(self.__dict__) | {
+                '_static_attributes',
+                '_key_cache',
+                '_current_key',
+            }
+
         digest = hashes.Hash(hashes.SHA256(), backend=default_backend())
         digest.update(key)
         engine_key = digest.finalize()
 
         self._initialize_engine(engine_key)
+        return {
+            name: value
+            for name, value in self.__dict__.items()
+            if name not in static_attributes
+        }
 
     def encrypt(self, value):
         raise NotImplementedError('Subclasses must implement this!')
@@ -145,6 +258,7 @@ class AesGcmEngine(EncryptionDecryptionBaseEngine):
 
     def _initialize_engine(self, parent_class_key):
         self.secret_key = parent_class_key
+        self.algorithm = algorithms.AES(self.secret_key)
 
     def encrypt(self, value):
         if not isinstance(value, str):
@@ -153,9 +267,7 @@ class AesGcmEngine(EncryptionDecryptionBaseEngine):
             value = str(value)
         value = value.encode()
         iv = os.urandom(self.IV_BYTES_NEEDED)
-        cipher = Cipher(
-            algorithms.AES(self.secret_key), modes.GCM(iv), backend=default_backend()
-        )
+        cipher = Cipher(self.algorithm, modes.GCM(iv), backend=default_backend())
         encryptor = cipher.encryptor()
         encrypted = encryptor.update(value) + encryptor.finalize()
         assert len(encryptor.tag) == self.TAG_SIZE_BYTES
@@ -174,7 +286,7 @@ class AesGcmEngine(EncryptionDecryptionBaseEngine):
         ]
         decrypted = decrypted[self.IV_BYTES_NEEDED + self.TAG_SIZE_BYTES :]
         cipher = Cipher(
-            algorithms.AES(self.secret_key),
+            self.algorithm,
             modes.GCM(iv, tag),
             backend=default_backend(),
         )
@@ -339,17 +451,71 @@ class StringEncryptedType(TypeDecorator, ScalarCoercible):
             username = sa.Column(StringEncryptedType(
                 sa.Unicode, get_key))
 
+    The key parameter also accepts a :class:`Keyring`, in which case the
+    stored values are tagged with the id of the key they are encrypted with.
+
+    .. _blind-index:
+
+    Values encrypted with :class:`AesGcmEngine` or :class:`FernetEngine`
+    can't be searched, since each encryption of the same value produces a
+    different ciphertext. The ``blind_index`` parameter names a companion
+    column holding an HMAC-SHA256 digest of each value, computed with
+    ``blind_index_key``, which must differ from the encryption key. The
+    digest is assigned whenever the encrypted attribute is set through the
+    ORM, and equality comparisons of the encrypted column compare the
+    digests instead, so that lookups can use an index on the companion
+    column.
+
+    ::
+
+
+        class User(Base):
+            __tablename__ = 'user'
+            id = sa.Column(sa.Integer, primary_key=True)
+            email = sa.Column(StringEncryptedType(
+                sa.Unicode,
+                secret_key,
+                AesGcmEngine,
+                blind_index='email_index',
+                blind_index_key=index_key
+            ))
+            email_index = sa.Column(sa.String(64), index=True)
+
+
+        session.query(User).filter(User.email == 'john@example.com')
+        # WHERE user.email_index = <digest of 'john@example.com'>
+
+    Rows inserted or updated without the ORM need the digest assigned
+    explicitly, using :meth:`blind_index_digest`.
+
     """
 
     impl = String
     cache_ok = True
 
-    def __init__(self, type_in=None, key=None, engine=None, padding=None, **kwargs):
+    def __init__(
+        self,
+        type_in=None,
+        key=None,
+        engine=None,
+        padding=None,
+        blind_index=None,
+        blind_index_key=None,
+        **kwargs,
+    ):
         """Initialization."""
         if not cryptography:
             raise ImproperlyConfigured(
                 "'cryptography' is required to use StringEncryptedType"
             )
+        if blind_index is not None:
+            if blind_index_key is None:
+                raise ImproperlyConfigured(
+                    "'blind_index_key' is required to use a blind index"
+                )
+            register_blind_index_listeners()
+        self.blind_index = blind_index
+        self.blind_index_key = blind_index_key
         super().__init__(**kwargs)
         # set the underlying type
         if type_in is None:
@@ -373,62 +539,221 @@ class StringEncryptedType(TypeDecorator, ScalarCoercible):
         self._key = value
 
     def _update_key(self):
+        if isinstance(self._key, Keyring):
+            return
         key = self._key() if callable(self._key) else self._key
         self.engine._update_key(key)
 
+    def _create_engine(self, key=None):
+        """
+        Return a new engine of the same class and padding as the engine of
+        this type, initialized with given key.
+        """
+        engine = self.engine.__class__()
+        if isinstance(engine, AesEngine):
+            engine.padding_engine = self.engine.padding_engine
+        if key is not None:
+            engine._update_key(key() if callable(key) else key)
+        return engine
+
+    def _with_key(self, key):
+        """
+        Return a copy of this type using given key and its own engine.
+        """
+        type_ = copy.copy(self)
+        type_._key = key
+        type_.engine = self._create_engine()
+        type_._keyring_engines = {}
+        type_._update_key()
+        return type_
+
+    def _get_keyring_engine(self, key_id):
+        try:
+            key = self._key.keys[key_id]
+        except KeyError:
+            raise InvalidCiphertextError(f'Unknown key id {key_id!r}.')
+        if callable(key):
+            # The engines are cached by key material, so that rotated
+            # material returned by a callable key gets a new engine.
+            key = key()
+        try:
+            engines = self._keyring_engines
+        except AttributeError:
+            engines = self._keyring_engines = {}
+        try:
+            engine, engine_key = engines[key_id]
+        except KeyError:
+            pass
+        else:
+            if engine_key == key:
+                return engine
+        engine = self._create_engine(key)
+        engines[key_id] = engine, key
+        return engine
+
+    def _encrypt(self, value):
+        if isinstance(self._key, Keyring):
+            key_id = self._key.active
+            return (
+                key_id
+                + self._key.separator
+                + self._get_keyring_engine(key_id).encrypt(value)
+            )
+        return self.engine.encrypt(value)
+
+    def _decrypt(self, value):
+        if isinstance(self._key, Keyring):
+            key_id, value = self._key.split(value)
+            return self._get_keyring_engine(key_id).decrypt(value)
+        return self.engine.decrypt(value)
+
+    @property
+    def comparator_factory(self):
+        comparator_factory = TypeDecorator.comparator_factory.fget(self)
+        if self.blind_index is None:
+            return comparator_factory
+        return type(
+            'BlindIndexComparator', (BlindIndexComparator, comparator_factory), {}
+        )
+
     def process_bind_param(self, value, dialect):
         """Encrypt a value on the way in."""
         if value is not None:
             self._update_key()
+            return self._encrypt(self._convert_bind_value(value, dialect))
 
-            try:
-                value = self.underlying_type.process_bind_param(value, dialect)
+    def blind_index_digest(self, value):
+        """
+        Return the blind index digest of given value, which is stored in the
+        companion column named by ``blind_index``. See :ref:`blind-index`.
 
-            except AttributeError:
-                # Doesn't have 'process_bind_param'
+        :param value: Unencrypted value
+        """
+        if value is None:
+            return None
+        key = self.blind_index_key
+        if callable(key):
+            key = key()
+        if isinstance(key, str):
+            key = key.encode()
+        value = self._convert_bind_value(value, None)
+        if not isinstance(value, str):
+            value = repr(value)
+        return hmac.new(key, value.encode(), hashlib.sha256).hexdigest()
 
-                # Handle 'boolean' and 'dates'
-                type_ = self.underlying_type.python_type
-                if issubclass(type_, bool):
-                    value = 'true' if value else 'false'
+    def _convert_bind_value(self, value, dialect):
+        try:
+            value = self.underlying_type.process_bind_param(value, dialect)
 
-                elif issubclass(type_, (datetime.date, datetime.time)):
-                    value = value.isoformat()
+        except AttributeError:
+            # Doesn't have 'process_bind_param'
 
-                elif issubclass(type_, JSONType):
-                    value = json.dumps(value)
+            # Handle 'boolean' and 'dates'
+            type_ = self.underlying_type.python_type
+            if issubclass(type_, bool):
+                value = 'true' if value else 'false'
 
-            return self.engine.encrypt(value)
+            elif issubclass(type_, (datetime.date, datetime.time)):
+                value = value.isoformat()
+
+            elif issubclass(type_, JSONType):
+                value = json.dumps(value)
+
+        return value
 
     def process_result_value(self, value, dialect):
         """Decrypt value on the way out."""
         if value is not None:
             self._update_key()
-            decrypted_value = self.engine.decrypt(value)
+            return self._decrypt_value(value, dialect)
+
+    def decrypt_many(
+        self,
+        values,
+        dialect=None,
+        max_workers=None,
+        chunk_size=1000,
+        executor=None,
+        return_exceptions=False,
+    ):
+        """
+        Decrypt given stored values and return the results in the same order.
+
+        The values are split into chunks which are decrypted in a thread
+        pool. The ciphers of the ``cryptography`` library release the GIL,
+        so large result sets are decrypted on several cores. The key is
+        resolved once for all the values.
+
+        ::
+
+            type_ = User.__table__.c.username.type
+            ciphertexts = session.scalars(
+                sa.select(sa.type_coerce(User.username, sa.String))
+            ).all()
+            usernames = type_.decrypt_many(ciphertexts, max_workers=4)
+
+        :param values: Sequence of stored, encrypted values
+        :param dialect: Dialect passed to the underlying type
+        :param max_workers: Number of threads of the pool created for
+            decrypting the values. Ignored if ``executor`` is given.
+        :param chunk_size: Number of values decrypted by a single task
+        :param executor: Optional :class:`concurrent.futures.Executor` to
+            decrypt the values with instead of creating a thread pool
+        :param return_exceptions: If True, a value failing to decrypt is
+            replaced by the raised exception, eg.
+            :class:`InvalidCiphertextError`, instead of the exception being
+            raised
+        """
+        values = list(values)
+        self._update_key()
+
+        def decrypt_chunk(chunk):
+            results = []
+            for value in chunk:
+                try:
+                    results.append(
+                        None if value is None else self._decrypt_value(value, dialect)
+                    )
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    results.append(exc)
+            return results
+
+        value_chunks = list(chunks(values, chunk_size))
+        if executor is not None:
+            results = executor.map(decrypt_chunk, value_chunks)
+        elif len(value_chunks) > 1 and max_workers != 1:
+            with ThreadPoolExecutor(max_workers) as executor:
+                results = list(executor.map(decrypt_chunk, value_chunks))
+        else:
+            results = map(decrypt_chunk, value_chunks)
+        return list(itertools.chain.from_iterable(results))
+
+    def _decrypt_value(self, value, dialect):
+        decrypted_value = self._decrypt(value)
 
-            try:
-                return self.underlying_type.process_result_value(
-                    decrypted_value, dialect
-                )
+        try:
+            return self.underlying_type.process_result_value(decrypted_value, dialect)
 
-            except AttributeError:
-                # Doesn't have 'process_result_value'
+        except AttributeError:
+            # Doesn't have 'process_result_value'
 
-                # Handle 'boolean' and 'dates'
-                type_ = self.underlying_type.python_type
-                date_types = [datetime.datetime, datetime.time, datetime.date]
+            # Handle 'boolean' and 'dates'
+            type_ = self.underlying_type.python_type
+            date_types = [datetime.datetime, datetime.time, datetime.date]
 
-                if issubclass(type_, bool):
-                    return decrypted_value == 'true'
+            if issubclass(type_, bool):
+                return decrypted_value == 'true'
 
-                elif type_ in date_types:
-                    return DatetimeHandler.process_value(decrypted_value, type_)
+            elif type_ in date_types:
+                return DatetimeHandler.process_value(decrypted_value, type_)
 
-                elif issubclass(type_, JSONType):
-                    return json.loads(decrypted_value)
+            elif issubclass(type_, JSONType):
+                return json.loads(decrypted_value)
 
-                # Handle all others
-                return self.underlying_type.python_type(decrypted_value)
+            # Handle all others
+            return self.underlying_type.python_type(decrypted_value)
 
     def _coerce(self, value):
         if isinstance(self.underlying_type, ScalarCoercible):
@@ -468,6 +793,96 @@ class EncryptedType(StringEncryptedType):
             value = super().process_result_value(value=value, dialect=dialect)
         return value
 
+    def _decrypt_value(self, value, dialect):
+        if isinstance(value, bytes):
+            value = super()._decrypt_value(value.decode(), dialect)
+        return value
+
+
+class BlindIndexComparator(TypeDecorator.Comparator):
+    """
+    Comparator of :class:`StringEncryptedType` columns with a blind index,
+    which compares the blind index column instead of the encrypted column
+    when the column is compared to plain values.
+    """
+
+    __slots__ = ()
+
+    def operate(self, op, *other, **kwargs):
+        index = self._blind_index_column()
+        if index is not None and other:
+            type_ = self.expr.type
+            if op in (operators.eq, operators.ne) and is_plain_value(other[0]):
+                return op(index, type_.blind_index_digest(other[0]))
+            if (
+                op in (operators.in_op, operators.not_in_op)
+                and isinstance(other[0], (list, tuple, set))
+                and all(is_plain_value(value) for value in other[0])
+            ):
+                return op(
+                    index, [type_.blind_index_digest(value) for value in other[0]]
+                )
+        return super().operate(op, *other, **kwargs)
+
+    def _blind_index_column(self):
+        table = getattr(self.expr, 'table', None)
+        if table is None:
+            return None
+        try:
+            return table.c[self.expr.type.blind_index]
+        except KeyError:
+            return None
+
+
+def is_plain_value(value):
+    return value is not None and not isinstance(
+        value, (sa.sql.ClauseElement, operators.ColumnOperators)
+    )
+
+
+def assign_blind_index_listeners(mapper, class_):
+    for prop in mapper.column_attrs:
+        column = prop.columns[0]
+        type_ = column.type
+        if (
+            prop.parent is not mapper
+            or not isinstance(type_, StringEncryptedType)
+            or type_.blind_index is None
+        ):
+            # Inherited properties are covered by the listener of the mapper
+            # defining them, which propagates to subclasses.
+            continue
+        try:
+            index_column = column.table.c[type_.blind_index]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f'Blind index column {type_.blind_index!r} of {class_.__name__}.'
+                f'{prop.key} does not exist in table {column.table.name!r}.'
+            )
+        index_key = mapper.get_property_by_column(index_column).key
+        sa.event.listen(
+            prop.class_attribute,
+            'set',
+            blind_index_listener(type_, index_key),
+            propagate=True,
+        )
+
+
+def blind_index_listener(type_, index_key):
+    def set_blind_index(target, value, oldvalue, initiator):
+        setattr(target, index_key, type_.blind_index_digest(value))
+
+    return set_blind_index
+
+
+def register_blind_index_listeners():
+    if not sa.event.contains(
+        sa.orm.Mapper, 'mapper_configured', assign_blind_index_listeners
+    ):
+        sa.event.listen(
+            sa.orm.Mapper, 'mapper_configured', assign_blind_index_listeners
+        )
+
 
 class DatetimeHandler:
     """
@@ -495,3 +910,136 @@ class DatetimeHandler:
             return return_value.time()
         elif issubclass(python_type, datetime.date):
             return return_value.date()
+
+
+def reencrypt_column(
+    session,
+    attr,
+    old_key,
+    new_key,
+    batch_size=1000,
+    where=None,
+    progress=None,
+):
+    """
+    Re-encrypt the values of given :class:`StringEncryptedType` or
+    :class:`EncryptedType` column, which were encrypted with ``old_key``,
+    with ``new_key``. This is useful for rotating the key of an encrypted
+    column.
+
+    The rows are read in batches in primary key order, each batch starting
+    after the last primary key of the previous batch, so that the table is
+    never loaded as a whole. The values are decrypted and encrypted again
+    without converting them to Python objects, written back with a single
+    executemany UPDATE per batch and committed separately, so that large
+    tables are not re-encrypted within one long transaction. An interrupted
+    rotation can be resumed with a ``where`` condition skipping the rows
+    already processed.
+
+    ::
+
+        from sqlalchemy_utils import reencrypt_column
+
+
+        reencrypt_column(
+            session,
+            User.access_token,
+            old_key,
+            new_key,
+            batch_size=10000,
+            progress=lambda count, elapsed: print(
+                f'{count} rows, {count / elapsed:.0f} rows/s'
+            )
+        )
+
+    Either key can be a :class:`Keyring`. Passing the keyring of the column
+    as both keys re-encrypts the values with its active key, while the
+    application keeps reading and writing the column::
+
+        reencrypt_column(
+            session,
+            User.username,
+            keyring,
+            keyring,
+            where=~sa.type_coerce(User.username, sa.String).startswith(
+                keyring.active + keyring.separator
+            )
+        )
+
+    :param session: SQLAlchemy session object
+    :param attr: Encrypted attribute, for example ``User.access_token``
+    :param old_key: Key, key callable or :class:`Keyring` the values are
+        encrypted with
+    :param new_key: Key, key callable or :class:`Keyring` to encrypt the
+        values with
+    :param batch_size: Number of rows to re-encrypt per batch
+    :param where: Optional SQL expression limiting the rows to re-encrypt
+    :param progress:
+        Optional callable which is called with the number of rows
+        re-encrypted so far and the number of seconds elapsed after each
+        committed batch
+    :return: The number of rows re-encrypted
+    """
+    column = attr.property.columns[0]
+    type_ = column.type
+    if not isinstance(type_, StringEncryptedType):
+        raise ValueError(f'{attr} is not an encrypted attribute.')
+    old_type = type_._with_key(old_key)
+    new_type = type_._with_key(new_key)
+
+    table = column.table
+    primary_key = list(table.primary_key.columns)
+    primary_key_value = (
+        primary_key[0] if len(primary_key) == 1 else sa.tuple_(*primary_key)
+    )
+    query = (
+        sa.select(*primary_key, sa.type_coerce(column, type_.impl))
+        .where(column.isnot(None))
+        .order_by(*primary_key)
+        .limit(batch_size)
+    )
+    if where is not None:
+        query = query.where(where)
+    update = (
+        table.update()
+        .where(
+            *(
+                primary_key_column == sa.bindparam(f'_pk_{index}')
+                for index, primary_key_column in enumerate(primary_key)
+            )
+        )
+        .values({column.key: sa.bindparam('_value', type_=type_.impl)})
+    )
+
+    count = 0
+    start = time.perf_counter()
+    last = None
+    while True:
+        batch_query = query
+        if last is not None:
+            batch_query = query.where(
+                primary_key_value > (last[0] if len(last) == 1 else sa.tuple_(*last))
+            )
+        rows = session.execute(batch_query).all()
+        if not rows:
+            return count
+        params = []
+        for row in rows:
+            *keys, value = row
+            if isinstance(value, bytes):
+                value = new_type._encrypt(old_type._decrypt(value.decode()))
+                value = value.encode()
+            else:
+                value = new_type._encrypt(old_type._decrypt(value))
+            params.append(
+                dict(
+                    {f'_pk_{index}': key for index, key in enumerate(keys)},
+                    _value=value,
+                )
+            )
+        session.execute(update, params)
+        session.commit()
+        last = tuple(rows[-1][: len(primary_key)])
+        count += len(rows)
+        if progress is not None:
+            progress(count, time.perf_counter() - start)
@@ -18,3 +18,11 @@ def starts_with(iterable, prefix):
     Returns whether or not given iterable starts with given prefix.
     """
     return list(iterable)[0 : len(prefix)] == list(prefix)
+
+
+def chunks(values, size):
+    """
+    Split given list of values into lists of at most given size.
+    """
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
@@ -0,0 +1,134 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.aggregates import aggregated, track_bulk_aggregates
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Integer, default=0),
+            incremental=True,
+            deferred=True
+        )
+        def deferred_comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def init_models(Thread, Comment):
+    pass
+
+
+@pytest.fixture
+def threads(session, Thread):
+    threads = [Thread(name='thread'), Thread(name='other thread')]
+    session.add_all(threads)
+    session.commit()
+    track_bulk_aggregates(session)
+    return threads
+
+
+def comment_counts(session, threads):
+    session.commit()
+    for thread in threads:
+        session.refresh(thread)
+    return [
+        (thread.comment_count, thread.deferred_comment_count)
+        for thread in threads
+    ]
+
+
+class TestBulkOperations:
+
+    def test_bulk_insert(self, session, Comment, threads):
+        session.execute(
+            sa.insert(Comment),
+            [
+                {'thread_id': threads[0].id},
+                {'thread_id': threads[0].id},
+                {'thread_id': threads[1].id},
+            ]
+        )
+        assert comment_counts(session, threads) == [(2, 2), (1, 1)]
+
+    def test_insert_values(self, session, Comment, threads):
+        session.execute(sa.insert(Comment).values(thread_id=threads[1].id))
+        assert comment_counts(session, threads) == [(0, 0), (1, 1)]
+
+    def test_insert_from_select(self, session, Thread, Comment, threads):
+        session.execute(
+            sa.insert(Comment).from_select(
+                ['thread_id'],
+                sa.select(Thread.id).where(Thread.id == threads[0].id)
+            )
+        )
+        assert comment_counts(session, threads) == [(1, 1), (0, 0)]
+
+    def test_insert_multiple_values(self, session, Comment, threads):
+        session.execute(
+            sa.insert(Comment).values(
+                [{'thread_id': threads[0].id}, {'thread_id': threads[1].id}]
+            )
+        )
+        assert comment_counts(session, threads) == [(1, 1), (1, 1)]
+
+    def test_update_where(self, session, Comment, threads):
+        session.add_all([Comment(thread=threads[0]) for _ in range(2)])
+        session.commit()
+        session.execute(
+            sa.update(Comment)
+            .where(Comment.thread_id == threads[0].id)
+            .values(thread_id=threads[1].id)
+        )
+        assert comment_counts(session, threads) == [(0, 0), (2, 2)]
+
+    def test_bulk_update_by_primary_key(self, session, Comment, threads):
+        comment = Comment(thread=threads[0])
+        session.add(comment)
+        session.commit()
+        session.execute(
+            sa.update(Comment),
+            [{'id': comment.id, 'thread_id': threads[1].id}]
+        )
+        assert comment_counts(session, threads) == [(0, 0), (1, 1)]
+
+    def test_delete_where(self, session, Comment, threads):
+        session.add_all([Comment(thread=thread) for thread in threads])
+        session.commit()
+        session.execute(
+            sa.delete(Comment).where(Comment.thread_id == threads[0].id)
+        )
+        assert comment_counts(session, threads) == [(0, 0), (1, 1)]
+
+    def test_ignores_untracked_sessions(self, session, Comment, Thread):
+        thread = Thread(name='thread')
+        session.add(thread)
+        session.commit()
+        session.execute(sa.insert(Comment).values(thread_id=thread.id))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 0
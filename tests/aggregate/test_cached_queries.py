@@ -0,0 +1,65 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import aggregates
+from sqlalchemy_utils.aggregates import aggregated
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def init_models(Thread, Comment):
+    pass
+
+
+class TestCachedAggregateQueries:
+
+    def test_builds_queries_once(self, session, Thread):
+        aggregate_value = aggregates.manager.get_aggregated_value(
+            Thread.comment_count
+        )
+        query = aggregate_value.cached_query('values_update_query')
+        assert query is aggregate_value.cached_query('values_update_query')
+
+    def test_reuses_compiled_query_for_different_values(
+        self,
+        session,
+        Thread,
+        Comment,
+        capture_statements
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        threads = [Thread(name=f'thread {index}') for index in range(3)]
+        session.add_all(threads)
+        session.add(Comment(thread=threads[0]))
+        session.flush()
+        session.add_all([Comment(thread=thread) for thread in threads])
+        session.flush()
+        assert len(thread_updates) == 2
+        assert thread_updates[0].compiled is thread_updates[1].compiled
+        for thread, count in zip(threads, [2, 1, 1]):
+            session.refresh(thread)
+            assert thread.comment_count == count
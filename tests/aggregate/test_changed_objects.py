@@ -0,0 +1,183 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import aggregates
+from sqlalchemy_utils.aggregates import aggregated
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        type = sa.Column(sa.Unicode(50))
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+
+        __mapper_args__ = {
+            'polymorphic_on': type,
+            'polymorphic_identity': 'comment'
+        }
+    return Comment
+
+
+@pytest.fixture
+def Reply(Comment):
+    class Reply(Comment):
+        __mapper_args__ = {'polymorphic_identity': 'reply'}
+    return Reply
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def init_models(Comment, Reply, Thread):
+    pass
+
+
+class TestChangedObjects:
+
+    def test_mapper_index_includes_subclasses(
+        self,
+        session,
+        Thread,
+        Comment,
+        Reply
+    ):
+        index = aggregates.manager.mapper_index
+        assert index[sa.inspect(Comment)] == index[sa.inspect(Reply)]
+        assert sa.inspect(Thread) not in index
+
+    def test_assigns_aggregates_for_subclass_objects(
+        self,
+        session,
+        Thread,
+        Reply
+    ):
+        thread = Thread(name='some thread')
+        session.add(Reply(thread=thread))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 1
+
+    def test_ignores_unchanged_objects(
+        self,
+        session,
+        Thread,
+        Comment,
+        capture_statements
+    ):
+        thread = Thread(name='some thread')
+        thread2 = Thread(name='some other thread')
+        session.add_all([Comment(thread=thread), Comment(thread=thread2)])
+        session.commit()
+        session.query(Comment).all()
+        thread_updates = capture_statements('UPDATE thread')
+
+        session.add(Comment(thread=thread))
+        session.flush()
+        assert [update.parameters for update in thread_updates] == [
+            ('1', thread.id)
+        ]
+
+    def test_ignores_changes_to_unrelated_columns(
+        self,
+        session,
+        Thread,
+        Comment,
+        capture_statements
+    ):
+        thread = Thread(name='some thread')
+        comment = Comment(thread=thread, content='Some content')
+        session.add(comment)
+        session.commit()
+        thread_updates = capture_statements('UPDATE thread')
+
+        comment.content = 'Updated content'
+        session.flush()
+        assert thread_updates == []
+
+    def test_updates_when_parent_linkage_changes(
+        self,
+        session,
+        Thread,
+        Comment
+    ):
+        thread = Thread(name='some thread')
+        thread2 = Thread(name='some other thread')
+        comment = Comment(thread=thread)
+        session.add_all([comment, thread2])
+        session.commit()
+
+        comment.thread = thread2
+        session.commit()
+        session.refresh(thread)
+        session.refresh(thread2)
+        assert thread.comment_count == 0
+        assert thread2.comment_count == 1
+
+    def test_aggregate_dependencies(self, session, Thread, Comment):
+        value = aggregates.manager.mapper_index[sa.inspect(Comment)][0]
+        assert value.dependencies == {'thread_id'}
+
+
+class TestLiteralColumnDependencies:
+
+    @pytest.fixture
+    def Comment(self, Base):
+        class Comment(Base):
+            __tablename__ = 'comment'
+            id = sa.Column(sa.Integer, primary_key=True)
+            score = sa.Column(sa.Integer)
+            thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+        return Comment
+
+    @pytest.fixture
+    def Thread(self, Base, Comment):
+        class Thread(Base):
+            __tablename__ = 'thread'
+            id = sa.Column(sa.Integer, primary_key=True)
+
+            @aggregated('comments', sa.Column(sa.Integer, default=0))
+            def total_score(self):
+                return sa.func.sum(sa.literal_column('comment.score'))
+
+            comments = sa.orm.relationship('Comment', backref='thread')
+        return Thread
+
+    @pytest.fixture
+    def init_models(self, Comment, Thread):
+        pass
+
+    def test_aggregate_dependencies(self, session, Thread, Comment):
+        value = aggregates.manager.mapper_index[sa.inspect(Comment)][0]
+        assert value.dependencies is None
+
+    def test_updates_when_literal_column_changes(
+        self,
+        session,
+        Thread,
+        Comment
+    ):
+        thread = Thread()
+        comment = Comment(thread=thread, score=1)
+        session.add_all([comment, Comment(thread=thread, score=2)])
+        session.commit()
+
+        comment.score = 100
+        session.commit()
+        session.refresh(thread)
+        assert thread.total_score == 102
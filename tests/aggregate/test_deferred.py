@@ -0,0 +1,202 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.aggregates import aggregated, flush_aggregates
+from sqlalchemy_utils.observer import observes
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def Thread(Base, Comment):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Integer, default=0),
+            deferred=True
+        )
+        def comment_count(self):
+            return sa.func.count('1')
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Integer, default=0),
+            incremental=True,
+            deferred=True
+        )
+        def incremental_comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def init_models(Comment, Thread):
+    pass
+
+
+class TestDeferredAggregates:
+
+    def test_updates_aggregates_once_per_commit(
+        self,
+        session,
+        Thread,
+        Comment,
+        capture_statements
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        thread = Thread(name='some thread')
+        session.add(thread)
+        for _ in range(3):
+            session.add(Comment(thread=thread))
+            session.flush()
+        assert thread_updates == []
+        session.commit()
+        assert len(thread_updates) == 2
+        session.refresh(thread)
+        assert thread.comment_count == 3
+        assert thread.incremental_comment_count == 3
+
+    def test_flush_aggregates(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread))
+        flush_aggregates(session)
+        session.refresh(thread)
+        assert thread.comment_count == 1
+        assert thread.incremental_comment_count == 1
+
+    def test_rollback_discards_pending_aggregates(
+        self,
+        session,
+        Thread,
+        Comment,
+        capture_statements
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread))
+        session.flush()
+        session.rollback()
+        session.commit()
+        assert thread_updates == []
+
+    def test_close_discards_pending_aggregates(
+        self,
+        session,
+        Thread,
+        Comment
+    ):
+        thread = Thread(name='some thread')
+        session.add(thread)
+        session.commit()
+        session.add(Comment(thread=thread))
+        session.flush()
+        session.close()
+
+        thread = session.query(Thread).one()
+        thread.name = 'renamed thread'
+        session.commit()
+        session.refresh(thread)
+        assert session.query(Comment).count() == 0
+        assert thread.comment_count == 0
+        assert thread.incremental_comment_count == 0
+
+    def test_applies_changes_flushed_by_before_commit_listeners(
+        self,
+        session,
+        Thread,
+        Comment
+    ):
+        thread = Thread(name='some thread')
+        session.add(thread)
+        session.commit()
+
+        @sa.event.listens_for(session, 'before_commit', once=True)
+        def add_comment(session):
+            session.add(Comment(thread=thread))
+
+        session.commit()
+        session.refresh(thread)
+        assert session.query(Comment).count() == 1
+        assert thread.comment_count == 1
+        assert thread.incremental_comment_count == 1
+
+    def test_savepoint_rollback_recomputes_deltas(
+        self,
+        session,
+        Thread,
+        Comment
+    ):
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread))
+        session.flush()
+        savepoint = session.begin_nested()
+        session.add(Comment(thread=thread))
+        session.flush()
+        savepoint.rollback()
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 1
+        assert thread.incremental_comment_count == 1
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestDeferredAggregatesWithCommitObservers:
+
+    @pytest.fixture
+    def Item(self, Base):
+        class Item(Base):
+            __tablename__ = 'item'
+            id = sa.Column(sa.Integer, primary_key=True)
+            price = sa.Column(sa.Integer)
+            quantity = sa.Column(sa.Integer)
+            total_price = sa.Column(sa.Integer)
+            order_id = sa.Column(sa.Integer, sa.ForeignKey('order.id'))
+
+            @observes('price', 'quantity', when='commit')
+            def total_price_observer(self, price, quantity):
+                self.total_price = price * quantity
+        return Item
+
+    @pytest.fixture
+    def Order(self, Base, Item):
+        class Order(Base):
+            __tablename__ = 'order'
+            id = sa.Column(sa.Integer, primary_key=True)
+
+            @aggregated('items', sa.Column(sa.Integer), deferred=True)
+            def total(self):
+                return sa.func.sum(Item.total_price)
+
+            items = sa.orm.relationship('Item', backref='order')
+        return Order
+
+    @pytest.fixture
+    def init_models(self, Item, Order):
+        pass
+
+    def test_applies_changes_flushed_by_commit_observers(
+        self,
+        session,
+        Order,
+        Item
+    ):
+        order = Order(items=[Item(price=5, quantity=2)])
+        session.add(order)
+        session.commit()
+        session.refresh(order)
+        assert order.items[0].total_price == 10
+        assert order.total == 10
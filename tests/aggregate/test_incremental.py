@@ -0,0 +1,156 @@
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import aggregates
+from sqlalchemy_utils.aggregates import aggregated
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        score = sa.Column(sa.Numeric)
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def Thread(Base, Comment):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Integer, default=0),
+            incremental=True
+        )
+        def comment_count(self):
+            return sa.func.count('1')
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Numeric, default=0),
+            incremental=True
+        )
+        def total_score(self):
+            return sa.func.sum(Comment.score)
+
+        @aggregated('comments', sa.Column(sa.Numeric), incremental=True)
+        def average_score(self):
+            return sa.func.avg(Comment.score)
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def init_models(Comment, Thread):
+    pass
+
+
+class TestIncrementalAggregates:
+
+    def test_decomposable_aggregates_are_incremental(self, session, Thread):
+        manager = aggregates.manager
+        assert manager.get_aggregated_value(Thread.comment_count).incremental
+        assert manager.get_aggregated_value(Thread.total_score).incremental
+
+    def test_falls_back_to_recompute_for_average(self, session, Thread):
+        aggregate_value = aggregates.manager.get_aggregated_value(
+            Thread.average_score
+        )
+        assert not aggregate_value.incremental
+
+    def test_assigns_aggregates_on_insert(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        session.add(thread)
+        session.add(Comment(thread=thread, score=Decimal('2')))
+        session.add(Comment(thread=thread, score=Decimal('3')))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 2
+        assert thread.total_score == Decimal('5')
+        assert thread.average_score == Decimal('2.5')
+
+    def test_assigns_aggregates_on_update(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        comment = Comment(thread=thread, score=Decimal('2'))
+        session.add(comment)
+        session.commit()
+        comment.score = Decimal('7')
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 1
+        assert thread.total_score == Decimal('7')
+
+    def test_assigns_aggregates_on_delete(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread, score=Decimal('2')))
+        comment = Comment(thread=thread, score=Decimal('3'))
+        session.add(comment)
+        session.commit()
+        session.delete(comment)
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 1
+        assert thread.total_score == Decimal('2')
+
+    def test_moves_values_between_parents(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        thread2 = Thread(name='some other thread')
+        comment = Comment(thread=thread, score=Decimal('3'))
+        session.add_all([comment, thread2])
+        session.commit()
+        comment.thread = thread2
+        session.commit()
+        session.refresh(thread)
+        session.refresh(thread2)
+        assert thread.comment_count == 0
+        assert thread.total_score == Decimal('0')
+        assert thread2.comment_count == 1
+        assert thread2.total_score == Decimal('3')
+
+    def test_applies_deltas_instead_of_recomputing(
+        self,
+        session,
+        Thread,
+        Comment
+    ):
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread, score=Decimal('3')))
+        session.commit()
+        session.execute(
+            sa.update(Thread.__table__).values(comment_count=10)
+        )
+        session.add(Comment(thread=thread, score=Decimal('1')))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 11
+
+    def test_configuring_further_mappers_does_not_duplicate_deltas(
+        self,
+        session,
+        Base,
+        Thread,
+        Comment
+    ):
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread, score=Decimal('3')))
+        session.commit()
+
+        class Tag(Base):
+            __tablename__ = 'tag'
+            id = sa.Column(sa.Integer, primary_key=True)
+
+        sa.orm.configure_mappers()
+        session.add(Comment(thread=thread, score=Decimal('1')))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 2
+        assert thread.total_score == Decimal('4')
@@ -0,0 +1,121 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import aggregates
+from sqlalchemy_utils.aggregates import aggregated
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def init_models(Thread, Comment):
+    pass
+
+
+@pytest.fixture
+def threads(session, Thread, Comment):
+    threads = [Thread(name=f'thread {index}') for index in range(5)]
+    session.add_all(threads)
+    session.commit()
+    return threads
+
+
+class TestLargeAggregateUpdates:
+
+    def test_deduplicates_values(
+        self,
+        session,
+        Comment,
+        threads,
+        capture_statements
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        session.add_all([Comment(thread=threads[0]) for _ in range(3)])
+        session.flush()
+        assert thread_updates[0].parameters == ('1', threads[0].id)
+
+    def test_splits_values_into_chunks(
+        self,
+        session,
+        Comment,
+        threads,
+        capture_statements,
+        monkeypatch
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        monkeypatch.setattr(aggregates.manager, 'chunk_size', 2)
+        session.add_all([Comment(thread=thread) for thread in threads])
+        session.commit()
+        assert len(thread_updates) == 3
+        for thread in threads:
+            session.refresh(thread)
+            assert thread.comment_count == 1
+
+    def test_uses_temporary_table_above_threshold(
+        self,
+        session,
+        Comment,
+        threads,
+        capture_statements,
+        monkeypatch
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        monkeypatch.setattr(aggregates.manager, 'temporary_table_threshold', 2)
+        session.add_all([Comment(thread=thread) for thread in threads])
+        session.commit()
+        assert len(thread_updates) == 1
+        assert 'SELECT aggregate_values.value' in thread_updates[0].statement
+        for thread in threads:
+            session.refresh(thread)
+            assert thread.comment_count == 1
+
+    def test_drops_temporary_table_when_update_fails(
+        self,
+        session,
+        Thread,
+        threads,
+        monkeypatch
+    ):
+        def execute_update_query(*args):
+            raise ValueError('update failed')
+
+        monkeypatch.setattr(aggregates.manager, 'temporary_table_threshold', 2)
+        monkeypatch.setattr(
+            aggregates.manager, 'execute_update_query', execute_update_query
+        )
+        aggregate_value = aggregates.manager.get_aggregated_value(
+            Thread.comment_count
+        )
+        with pytest.raises(ValueError):
+            aggregates.manager.execute_grouped_update_queries(
+                session,
+                aggregate_value,
+                [],
+                [thread.id for thread in threads]
+            )
+        assert 'aggregate_values' not in (
+            sa.inspect(session.connection()).get_temp_table_names()
+        )
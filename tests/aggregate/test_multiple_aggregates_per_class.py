@@ -1,6 +1,8 @@
 import pytest
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
+from sqlalchemy_utils import aggregates
 from sqlalchemy_utils.aggregates import aggregated
 
 
@@ -94,3 +96,52 @@ class TestAggregateValueGenerationForSimpleModelPaths:
         session.refresh(thread)
         assert thread.comment_count == 0
         assert thread.last_comment_id is None
+
+
+class TestFusedAggregateUpdates:
+
+    def test_updates_aggregates_with_single_statement(
+        self,
+        session,
+        Thread,
+        Comment,
+        capture_statements
+    ):
+        thread_updates = capture_statements('UPDATE thread')
+        thread = Thread(name='some article name')
+        session.add(Comment(content='Some content', thread=thread))
+        session.commit()
+        assert len(thread_updates) == 1
+        session.refresh(thread)
+        assert thread.comment_count == 1
+        assert thread.last_comment_id == 1
+
+    def test_update_from_query(self, session, Thread, Comment):
+        thread = Thread(name='some article name')
+        thread2 = Thread(name='some other article name')
+        session.add_all([Comment(thread=thread), Comment(thread=thread), thread2])
+        session.commit()
+        session.execute(
+            sa.update(Thread.__table__).values(comment_count=5, last_comment_id=5)
+        )
+        first, *others = aggregates.manager.get_aggregated_values(Thread)
+        session.execute(first.update_from_query([thread.id, thread2.id], others))
+        session.refresh(thread)
+        session.refresh(thread2)
+        assert thread.comment_count == 2
+        assert thread.last_comment_id == 2
+        assert thread2.comment_count == 0
+        assert thread2.last_comment_id is None
+
+    def test_update_from_query_groups_aggregated_table_once(
+        self,
+        session,
+        Thread
+    ):
+        first, *others = aggregates.manager.get_aggregated_values(Thread)
+        query = first.update_from_query([1, 2], others)
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert sql.count('FROM comment') == 0
+        assert sql.count('LEFT OUTER JOIN comment') == 1
+        assert 'GROUP BY thread_1.id' in sql
+        assert 'count(comment.id)' in sql
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.aggregates import aggregated, prefetch_aggregates
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def init_models(Thread, Comment):
+    pass
+
+
+@pytest.fixture
+def comments(session, Thread, Comment):
+    comments = [
+        Comment(thread=Thread(name=f'thread {index}')) for index in range(5)
+    ]
+    session.add_all(comments)
+    session.commit()
+    return comments
+
+
+class FakeAsyncSession:
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+
+class TestAggregatePrefetch:
+
+    def test_loads_expired_objects_in_one_query(
+        self,
+        session,
+        Thread,
+        comments,
+        capture_statements
+    ):
+        comment_selects = capture_statements('SELECT', 'FROM comment')
+        for comment in comments:
+            session.delete(comment)
+        asyncio.run(prefetch_aggregates(FakeAsyncSession(session)))
+        assert len(comment_selects) == 1
+        session.commit()
+        assert len(comment_selects) == 1
+        assert [
+            thread.comment_count for thread in session.query(Thread)
+        ] == [0] * 5
@@ -0,0 +1,77 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import recompute_aggregates
+from sqlalchemy_utils.aggregates import aggregated
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def init_models(Thread, Comment):
+    pass
+
+
+@pytest.fixture
+def threads(session, Thread, Comment):
+    threads = [Thread(name=f'thread {index}') for index in range(5)]
+    session.add_all(threads)
+    for index, thread in enumerate(threads):
+        session.add_all([Comment(thread=thread) for _ in range(index)])
+    session.commit()
+    session.execute(sa.update(Thread.__table__).values(comment_count=None))
+    session.commit()
+    return threads
+
+
+class TestRecomputeAggregates:
+
+    def test_recomputes_all_rows_in_batches(self, session, Thread, threads):
+        progress = []
+        count = recompute_aggregates(
+            session,
+            Thread.comment_count,
+            batch_size=2,
+            progress=progress.append
+        )
+        assert count == 5
+        assert progress == [2, 4, 5]
+        assert [thread.comment_count for thread in threads] == [0, 1, 2, 3, 4]
+
+    def test_where(self, session, Thread, threads):
+        count = recompute_aggregates(
+            session,
+            Thread.comment_count,
+            where=Thread.id > threads[2].id
+        )
+        assert count == 2
+        assert [thread.comment_count for thread in threads] == [
+            None, None, None, 3, 4
+        ]
+
+    def test_raises_for_non_aggregated_attributes(self, session, Thread):
+        with pytest.raises(ValueError):
+            recompute_aggregates(session, Thread.name)
@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from sqlalchemy_utils import aggregates
+from sqlalchemy_utils.aggregates import aggregated, CreateAggregateTrigger
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        score = sa.Column(sa.Numeric)
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def Thread(Base, Comment):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Integer, default=0),
+            trigger=True
+        )
+        def comment_count(self):
+            return sa.func.count('1')
+
+        @aggregated(
+            'comments',
+            sa.Column(sa.Numeric, default=0),
+            trigger=True
+        )
+        def total_score(self):
+            return sa.func.sum(Comment.score)
+
+        @aggregated('comments', sa.Column(sa.Integer), trigger=True)
+        def last_comment_id(self):
+            return sa.func.max(Comment.id)
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def init_models(Comment, Thread):
+    pass
+
+
+class TestTriggerAggregates:
+
+    def test_orm_listeners_ignore_trigger_aggregates(
+        self,
+        session,
+        Comment
+    ):
+        assert aggregates.manager.mapper_index[sa.inspect(Comment)] == []
+
+    def test_assigns_aggregates_on_insert(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread, score=Decimal('2')))
+        session.add(Comment(thread=thread, score=Decimal('3')))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 2
+        assert thread.total_score == Decimal('5')
+        assert thread.last_comment_id == 2
+
+    def test_assigns_aggregates_on_update(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        thread2 = Thread(name='some other thread')
+        comment = Comment(thread=thread, score=Decimal('2'))
+        session.add_all([comment, thread2])
+        session.commit()
+        comment.thread = thread2
+        comment.score = Decimal('4')
+        session.commit()
+        session.refresh(thread)
+        session.refresh(thread2)
+        assert thread.comment_count == 0
+        assert thread.total_score == Decimal('0')
+        assert thread.last_comment_id is None
+        assert thread2.comment_count == 1
+        assert thread2.total_score == Decimal('4')
+        assert thread2.last_comment_id == comment.id
+
+    def test_assigns_aggregates_on_delete(self, session, Thread, Comment):
+        thread = Thread(name='some thread')
+        comment = Comment(thread=thread, score=Decimal('2'))
+        session.add(comment)
+        session.commit()
+        session.execute(sa.delete(Comment.__table__))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 0
+        assert thread.total_score == Decimal('0')
+
+    def test_create_all_twice(self, session, connection, Base, Thread, Comment):
+        with connection.begin():
+            Base.metadata.create_all(connection)
+        thread = Thread(name='some thread')
+        session.add(Comment(thread=thread, score=Decimal('2')))
+        session.commit()
+        session.refresh(thread)
+        assert thread.comment_count == 1
+        assert thread.total_score == Decimal('2')
+
+    def test_postgresql_trigger_ddl(self, session, Thread):
+        ddl = str(
+            CreateAggregateTrigger(
+                aggregates.manager.get_aggregated_value(Thread.comment_count),
+                'UPDATE'
+            ).compile(dialect=postgresql.dialect())
+        )
+        assert ddl == (
+            'CREATE TRIGGER thread_comment_count_update AFTER UPDATE OF '
+            'thread_id ON comment FOR EACH ROW EXECUTE PROCEDURE '
+            'thread_comment_count_update()'
+        )
@@ -0,0 +1,101 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import verify_aggregates
+from sqlalchemy_utils.aggregates import aggregated
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        content = sa.Column(sa.Unicode(255))
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def Thread(Base, Comment):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.Unicode(255))
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        @aggregated('comments', sa.Column(sa.Integer))
+        def last_comment_id(self):
+            return sa.func.max(Comment.id)
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def first_comment_id(self):
+            return sa.func.coalesce(sa.func.min(Comment.id), 0)
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def init_models(Comment, Thread):
+    pass
+
+
+@pytest.fixture
+def threads(session, Thread, Comment):
+    threads = [Thread(name=f'thread {index}') for index in range(5)]
+    session.add_all(threads)
+    for index, thread in enumerate(threads):
+        session.add_all([Comment(thread=thread) for _ in range(index)])
+    session.commit()
+    return threads
+
+
+class TestVerifyAggregates:
+
+    def test_returns_empty_list_for_correct_aggregates(
+        self,
+        session,
+        Thread,
+        threads
+    ):
+        assert verify_aggregates(session, Thread, batch_size=2) == []
+
+    def test_returns_mismatching_keys(self, session, Thread, threads):
+        session.execute(
+            sa.update(Thread.__table__)
+            .where(Thread.id.in_([threads[1].id, threads[4].id]))
+            .values(comment_count=10)
+        )
+        session.execute(
+            sa.update(Thread.__table__)
+            .where(Thread.id == threads[2].id)
+            .values(first_comment_id=10)
+        )
+        assert verify_aggregates(session, Thread, batch_size=2) == [
+            (threads[1].id, ),
+            (threads[2].id, ),
+            (threads[4].id, ),
+        ]
+
+    def test_sample(self, session, Thread, threads):
+        session.execute(sa.update(Thread.__table__).values(comment_count=10))
+        mismatches = verify_aggregates(
+            session,
+            Thread,
+            sample=0.5,
+            batch_size=2
+        )
+        assert len(mismatches) == 3
+
+    def test_repair(self, session, Thread, threads):
+        session.execute(sa.update(Thread.__table__).values(comment_count=10))
+        assert len(verify_aggregates(session, Thread, repair=True)) == 5
+        assert [thread.comment_count for thread in threads] == [0, 1, 2, 3, 4]
+        assert verify_aggregates(session, Thread) == []
+
+    def test_raises_for_models_without_aggregates(self, session, Comment):
+        with pytest.raises(ValueError):
+            verify_aggregates(session, Comment)
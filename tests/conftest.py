@@ -1,5 +1,6 @@
 import os
 import warnings
+from collections import namedtuple
 
 import pytest
 import sqlalchemy as sa
@@ -143,6 +144,33 @@ def connection(engine):
     return engine.connect()
 
 
+ExecutedStatement = namedtuple(
+    'ExecutedStatement',
+    ['statement', 'parameters', 'compiled']
+)
+
+
+@pytest.fixture
+def capture_statements(connection):
+    """
+    Return a function which starts collecting the statements executed on
+    the connection that begin with given prefix and optionally contain given
+    text.
+    """
+    def capture(prefix, contains=''):
+        executed = []
+
+        @sa.event.listens_for(connection, 'before_cursor_execute')
+        def collect(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith(prefix) and contains in statement:
+                executed.append(
+                    ExecutedStatement(statement, parameters, context.compiled)
+                )
+
+        return executed
+    return capture
+
+
 @pytest.fixture
 def Base():
     return declarative_base()
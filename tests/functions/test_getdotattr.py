@@ -1,7 +1,7 @@
 import pytest
 import sqlalchemy as sa
 
-from sqlalchemy_utils.functions import getdotattr
+from sqlalchemy_utils.functions import getdotattr, getdotattr_many
 
 
 @pytest.fixture
@@ -25,6 +25,10 @@ def Section(Base, Document):
         )
 
         document = sa.orm.relationship(Document, backref='sections')
+
+        @property
+        def owner(self):
+            return self.document
     return Section
 
 
@@ -105,3 +109,63 @@ class TestGetDotAttr:
             Section.document
         )
         assert getdotattr(Section, 'document.name') is Document.name
+
+
+class TestGetDotAttrMany:
+
+    @pytest.fixture
+    def documents(self, session, Document, Section, SubSection):
+        documents = [
+            Document(
+                name=f'document {index}',
+                sections=[
+                    Section(subsections=[SubSection(), SubSection()])
+                    for _ in range(2)
+                ]
+            )
+            for index in range(3)
+        ]
+        session.add_all(documents)
+        session.commit()
+        return documents
+
+    def test_loads_each_hop_once(self, session, SubSection, documents, capture_statements):
+        subsections = session.query(SubSection).all()
+        selects = capture_statements('SELECT')
+        values = getdotattr_many(subsections, 'section.document.name')
+        assert values == [
+            getdotattr(subsection, 'section.document.name')
+            for subsection in subsections
+        ]
+        assert sorted(set(values)) == ['document 0', 'document 1', 'document 2']
+        # two queries per relationship hop regardless of the object count
+        assert len(selects) == 4
+
+    def test_unmapped_attribute(self, session, SubSection, documents):
+        subsections = session.query(SubSection).all()
+        values = getdotattr_many(subsections, 'section.owner.name')
+        assert values == [
+            getdotattr(subsection, 'section.owner.name')
+            for subsection in subsections
+        ]
+        assert sorted(set(values)) == ['document 0', 'document 1', 'document 2']
+
+    def test_collections(self, session, Document, documents, capture_statements):
+        documents = session.query(Document).all()
+        selects = capture_statements('SELECT')
+        values = getdotattr_many(documents, 'sections.subsections')
+        assert [len(value) for value in values] == [4, 4, 4]
+        assert len(selects) == 4
+
+    def test_condition(self, session, Document, documents):
+        documents = session.query(Document).all()
+        values = getdotattr_many(
+            documents,
+            'sections.document',
+            lambda obj: getattr(obj, 'name', None) != 'document 1'
+        )
+        assert values == [
+            [documents[0], documents[0]],
+            [],
+            [documents[2], documents[2]],
+        ]
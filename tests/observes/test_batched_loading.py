@@ -0,0 +1,97 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.observer import observes
+
+
+@pytest.fixture
+def Catalog(Base):
+    class Catalog(Base):
+        __tablename__ = 'catalog'
+        id = sa.Column(sa.Integer, primary_key=True)
+        product_count = sa.Column(sa.Integer, default=0)
+
+        @observes('categories.products')
+        def product_observer(self, products):
+            self.product_count = len(products)
+
+        categories = sa.orm.relationship('Category', backref='catalog')
+    return Catalog
+
+
+@pytest.fixture
+def Category(Base):
+    class Category(Base):
+        __tablename__ = 'category'
+        id = sa.Column(sa.Integer, primary_key=True)
+        catalog_id = sa.Column(sa.Integer, sa.ForeignKey('catalog.id'))
+
+        products = sa.orm.relationship('Product', backref='category')
+    return Category
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        price = sa.Column(sa.Numeric)
+
+        category_id = sa.Column(sa.Integer, sa.ForeignKey('category.id'))
+    return Product
+
+
+@pytest.fixture
+def init_models(Catalog, Category, Product):
+    pass
+
+
+@pytest.fixture
+def catalogs(session, Catalog, Category, Product):
+    catalogs = [
+        Catalog(
+            categories=[
+                Category(products=[Product(price=1), Product(price=2)])
+                for _ in range(2)
+            ]
+        )
+        for _ in range(10)
+    ]
+    session.add_all(catalogs)
+    session.commit()
+    return catalogs
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestObserverBatchedLoading:
+
+    def test_loads_paths_in_batches(
+        self,
+        session,
+        Catalog,
+        Product,
+        catalogs,
+        capture_statements
+    ):
+        products = session.query(Product).all()
+        for product in products:
+            product.price = 3
+        selects = capture_statements('SELECT')
+        session.flush()
+        # two queries per relationship hop regardless of the object count
+        assert len(selects) == 8
+        for catalog in catalogs:
+            assert catalog.product_count == 4
+
+    def test_notifies_removed_objects(
+        self,
+        session,
+        Catalog,
+        Category,
+        catalogs
+    ):
+        session.delete(session.query(Category).first())
+        session.commit()
+        assert sorted(
+            catalog.product_count for catalog in catalogs
+        ) == [2] + [4] * 9
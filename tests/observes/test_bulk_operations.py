@@ -0,0 +1,99 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.observer import observes, track_bulk_observers
+
+
+@pytest.fixture
+def Catalog(Base):
+    class Catalog(Base):
+        __tablename__ = 'catalog'
+        id = sa.Column(sa.Integer, primary_key=True)
+        product_count = sa.Column(sa.Integer, default=0)
+
+        @observes('categories.products')
+        def product_observer(self, products):
+            self.product_count = len(products)
+
+        categories = sa.orm.relationship('Category', backref='catalog')
+    return Catalog
+
+
+@pytest.fixture
+def Category(Base):
+    class Category(Base):
+        __tablename__ = 'category'
+        id = sa.Column(sa.Integer, primary_key=True)
+        catalog_id = sa.Column(sa.Integer, sa.ForeignKey('catalog.id'))
+
+        products = sa.orm.relationship('Product', backref='category')
+    return Category
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        category_id = sa.Column(sa.Integer, sa.ForeignKey('category.id'))
+    return Product
+
+
+@pytest.fixture
+def init_models(Catalog, Category, Product):
+    pass
+
+
+@pytest.fixture
+def categories(session, Catalog, Category):
+    categories = [Category(catalog=Catalog()), Category(catalog=Catalog())]
+    session.add_all(categories)
+    session.commit()
+    track_bulk_observers(session)
+    return categories
+
+
+def product_counts(session, categories):
+    session.commit()
+    return [category.catalog.product_count for category in categories]
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestBulkOperations:
+
+    def test_bulk_insert(self, session, Product, categories):
+        session.execute(
+            sa.insert(Product),
+            [
+                {'category_id': categories[0].id},
+                {'category_id': categories[0].id},
+                {'category_id': categories[1].id},
+            ]
+        )
+        assert product_counts(session, categories) == [2, 1]
+
+    def test_bulk_insert_with_primary_keys(self, session, Product, categories):
+        session.execute(
+            sa.insert(Product),
+            [{'id': 10, 'category_id': categories[1].id}]
+        )
+        assert product_counts(session, categories) == [0, 1]
+
+    def test_update_where(self, session, Product, categories):
+        categories[0].products = [Product(), Product()]
+        session.commit()
+        session.execute(
+            sa.update(Product)
+            .where(Product.category_id == categories[0].id)
+            .values(category_id=categories[1].id)
+        )
+        assert product_counts(session, categories) == [0, 2]
+
+    def test_delete_where(self, session, Product, categories):
+        for category in categories:
+            category.products = [Product()]
+        session.commit()
+        session.execute(
+            sa.delete(Product).where(Product.category_id == categories[0].id)
+        )
+        assert product_counts(session, categories) == [0, 1]
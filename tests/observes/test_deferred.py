@@ -0,0 +1,106 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.observer import observes
+
+
+@pytest.fixture
+def Catalog(Base):
+    class Catalog(Base):
+        __tablename__ = 'catalog'
+        id = sa.Column(sa.Integer, primary_key=True)
+        product_count = sa.Column(sa.Integer, default=0)
+        calls = 0
+
+        @observes('categories.products', when='commit')
+        def product_observer(self, products):
+            type(self).calls += 1
+            self.product_count = len(products)
+
+        categories = sa.orm.relationship('Category', backref='catalog')
+    return Catalog
+
+
+@pytest.fixture
+def Category(Base):
+    class Category(Base):
+        __tablename__ = 'category'
+        id = sa.Column(sa.Integer, primary_key=True)
+        catalog_id = sa.Column(sa.Integer, sa.ForeignKey('catalog.id'))
+
+        products = sa.orm.relationship('Product', backref='category')
+    return Category
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        category_id = sa.Column(sa.Integer, sa.ForeignKey('category.id'))
+    return Product
+
+
+@pytest.fixture
+def init_models(Catalog, Category, Product):
+    pass
+
+
+@pytest.fixture
+def category(session, Catalog, Category):
+    category = Category(catalog=Catalog())
+    session.add(category)
+    session.commit()
+    Catalog.calls = 0
+    return category
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestObservesWhenCommit:
+
+    def test_invokes_callback_once_per_commit(
+        self,
+        session,
+        Catalog,
+        Product,
+        category
+    ):
+        for _ in range(3):
+            category.products.append(Product())
+            session.flush()
+        assert Catalog.calls == 0
+        session.commit()
+        assert Catalog.calls == 1
+        assert category.catalog.product_count == 3
+
+    def test_uses_objects_as_they_are_at_commit(
+        self,
+        session,
+        Catalog,
+        Product,
+        category
+    ):
+        product = Product()
+        category.products = [product, Product()]
+        session.flush()
+        session.delete(product)
+        session.flush()
+        session.commit()
+        assert category.catalog.product_count == 1
+
+    def test_rollback_discards_pending_callbacks(
+        self,
+        session,
+        Catalog,
+        Product,
+        category
+    ):
+        category.products.append(Product())
+        session.flush()
+        session.rollback()
+        session.commit()
+        assert Catalog.calls == 0
+
+    def test_unknown_when(self):
+        with pytest.raises(ValueError):
+            observes('categories', when='never')
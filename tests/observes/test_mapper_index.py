@@ -0,0 +1,84 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.observer import observer, observes
+
+
+@pytest.fixture
+def Catalog(Base):
+    class Catalog(Base):
+        __tablename__ = 'catalog'
+        id = sa.Column(sa.Integer, primary_key=True)
+        product_count = sa.Column(sa.Integer, default=0)
+
+        @observes('products')
+        def product_observer(self, products):
+            self.product_count = len(products)
+
+        products = sa.orm.relationship('Product', backref='catalog')
+    return Catalog
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        type = sa.Column(sa.String(50))
+        catalog_id = sa.Column(sa.Integer, sa.ForeignKey('catalog.id'))
+
+        __mapper_args__ = {
+            'polymorphic_on': type,
+            'polymorphic_identity': 'product'
+        }
+    return Product
+
+
+@pytest.fixture
+def Book(Product):
+    class Book(Product):
+        __mapper_args__ = {'polymorphic_identity': 'book'}
+    return Book
+
+
+@pytest.fixture
+def init_models(Catalog, Product, Book):
+    pass
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestObserverMapperIndex:
+
+    def test_includes_subclass_mappers(self, session, Catalog, Product, Book):
+        callbacks = observer.get_mapper_callbacks
+        assert callbacks(sa.inspect(Book)) == callbacks(sa.inspect(Product))
+        assert len(callbacks(sa.inspect(Catalog))) == 1
+
+    def test_notifies_observer_of_subclass_objects(
+        self,
+        session,
+        Catalog,
+        Book
+    ):
+        catalog = Catalog(products=[Book(), Book()])
+        session.add(catalog)
+        session.flush()
+        assert catalog.product_count == 2
+
+    def test_invalidated_when_new_mappers_are_configured(
+        self,
+        session,
+        Catalog,
+        Product
+    ):
+        class Magazine(Product):
+            __mapper_args__ = {'polymorphic_identity': 'magazine'}
+
+        sa.orm.configure_mappers()
+        callbacks = observer.get_mapper_callbacks
+        assert callbacks(sa.inspect(Magazine)) == callbacks(sa.inspect(Product))
+
+        catalog = Catalog(products=[Magazine()])
+        session.add(catalog)
+        session.flush()
+        assert catalog.product_count == 1
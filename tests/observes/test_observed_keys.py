@@ -0,0 +1,114 @@
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.observer import observer, observes
+
+
+@pytest.fixture
+def Catalog(Base):
+    class Catalog(Base):
+        __tablename__ = 'catalog'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+        total_price = sa.Column(sa.Integer, default=0)
+        calls = 0
+
+        @observes('categories.products.price')
+        def price_observer(self, prices):
+            type(self).calls += 1
+            self.total_price = sum(prices)
+
+        categories = sa.orm.relationship('Category', backref='catalog')
+    return Catalog
+
+
+@pytest.fixture
+def Category(Base):
+    class Category(Base):
+        __tablename__ = 'category'
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+        catalog_id = sa.Column(sa.Integer, sa.ForeignKey('catalog.id'))
+
+        products = sa.orm.relationship('Product', backref='category')
+    return Category
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        price = sa.Column(sa.Integer)
+        description = sa.Column(sa.String)
+
+        category_id = sa.Column(sa.Integer, sa.ForeignKey('category.id'))
+    return Product
+
+
+@pytest.fixture
+def init_models(Catalog, Category, Product):
+    pass
+
+
+@pytest.fixture
+def catalog(session, Catalog, Category, Product):
+    catalog = Catalog(
+        categories=[Category(products=[Product(price=1), Product(price=2)])]
+    )
+    session.add(catalog)
+    session.commit()
+    Catalog.calls = 0
+    return catalog
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestObservedKeys:
+
+    def test_callback_keys(self, session, Catalog, Category, Product):
+        keys = {
+            class_: [
+                callback.keys
+                for callback in observer.get_mapper_callbacks(sa.inspect(class_))
+            ]
+            for class_ in (Catalog, Category, Product)
+        }
+        assert keys[Catalog] == [{'categories', 'id'}]
+        assert keys[Category] == [{'products', 'catalog', 'catalog_id', 'id'}]
+        assert keys[Product] == [{'price', 'category', 'category_id'}]
+
+    def test_ignores_changes_to_unobserved_attributes(
+        self,
+        session,
+        Catalog,
+        catalog
+    ):
+        catalog.name = 'Catalog'
+        catalog.categories[0].name = 'Category'
+        catalog.categories[0].products[0].description = 'Product'
+        session.commit()
+        assert Catalog.calls == 0
+
+    def test_notifies_changes_to_observed_attributes(
+        self,
+        session,
+        Catalog,
+        catalog
+    ):
+        catalog.categories[0].products[0].price = 5
+        session.commit()
+        assert Catalog.calls == 1
+        assert catalog.total_price == 7
+
+    def test_notifies_changes_to_relationships(
+        self,
+        session,
+        Catalog,
+        Category,
+        catalog
+    ):
+        product = catalog.categories[0].products[0]
+        product.category = Category(catalog=catalog)
+        session.commit()
+        assert Catalog.calls == 1
+        assert catalog.total_price == 3
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils.observer import observes, prefetch_observed
+
+
+@pytest.fixture
+def Catalog(Base):
+    class Catalog(Base):
+        __tablename__ = 'catalog'
+        id = sa.Column(sa.Integer, primary_key=True)
+        product_count = sa.Column(sa.Integer, default=0)
+
+        @observes('categories.products')
+        def product_observer(self, products):
+            self.product_count = len(products)
+
+        categories = sa.orm.relationship('Category', backref='catalog')
+    return Catalog
+
+
+@pytest.fixture
+def Category(Base):
+    class Category(Base):
+        __tablename__ = 'category'
+        id = sa.Column(sa.Integer, primary_key=True)
+        catalog_id = sa.Column(sa.Integer, sa.ForeignKey('catalog.id'))
+
+        products = sa.orm.relationship('Product', backref='category')
+    return Category
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        price = sa.Column(sa.Numeric)
+
+        category_id = sa.Column(sa.Integer, sa.ForeignKey('category.id'))
+    return Product
+
+
+@pytest.fixture
+def init_models(Catalog, Category, Product):
+    pass
+
+
+@pytest.fixture
+def catalogs(session, Catalog, Category, Product):
+    catalogs = [
+        Catalog(categories=[Category(products=[Product(price=1)])])
+        for _ in range(5)
+    ]
+    session.add_all(catalogs)
+    session.commit()
+    return catalogs
+
+
+class FakeAsyncSession:
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestObserverPrefetch:
+
+    def test_flush_after_prefetch_loads_nothing(
+        self,
+        session,
+        Catalog,
+        Category,
+        Product,
+        catalogs,
+        capture_statements
+    ):
+        category = session.query(Category).first()
+        for product in session.query(Product).all():
+            product.price = 2
+        session.add(Product(price=3, category=category))
+        asyncio.run(prefetch_observed(FakeAsyncSession(session)))
+        selects = capture_statements('SELECT')
+        session.flush()
+        assert selects == []
+        assert sorted(catalog.product_count for catalog in catalogs) == [
+            1, 1, 1, 1, 2
+        ]
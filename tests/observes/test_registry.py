@@ -0,0 +1,62 @@
+import gc
+import weakref
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import declarative_base
+
+from sqlalchemy_utils.observer import observer, observes
+
+
+@pytest.fixture
+def Product(Base):
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        price = sa.Column(sa.Integer)
+
+        @observes('price')
+        def product_price_observer(self, price):
+            self.price = price * 2
+    return Product
+
+
+@pytest.fixture
+def init_models(Product):
+    pass
+
+
+def create_observed_class():
+    Base = declarative_base()
+
+    class Product(Base):
+        __tablename__ = 'product'
+        id = sa.Column(sa.Integer, primary_key=True)
+        price = sa.Column(sa.Integer)
+
+        @observes('price')
+        def product_price_observer(self, price):
+            pass
+
+    sa.orm.configure_mappers()
+    assert observer.get_mapper_callbacks(sa.inspect(Product))
+    return weakref.ref(Product)
+
+
+@pytest.mark.usefixtures('postgresql_dsn')
+class TestObserverRegistry:
+
+    def test_does_not_keep_classes_alive(self):
+        class_ref = create_observed_class()
+        gc.collect()
+        assert class_ref() is None
+
+    def test_unregister(self, session, Base, Product):
+        observer.unregister(Base)
+        assert Product not in observer.generator_registry
+        assert observer.get_mapper_callbacks(sa.inspect(Product)) == []
+
+        product = Product(price=100)
+        session.add(product)
+        session.flush()
+        assert product.price == 100
@@ -0,0 +1,148 @@
+import logging
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_utils import aggregated, observes
+from sqlalchemy_utils.instrumentation import (
+    instrumentation,
+    LoggingSink,
+    Measurement,
+    StatsCollector,
+    StatsdSink
+)
+
+
+@pytest.fixture
+def Thread(Base):
+    class Thread(Base):
+        __tablename__ = 'thread'
+        id = sa.Column(sa.Integer, primary_key=True)
+        comment_total = sa.Column(sa.Integer, default=0)
+
+        @aggregated('comments', sa.Column(sa.Integer, default=0))
+        def comment_count(self):
+            return sa.func.count('1')
+
+        @observes('comments')
+        def comment_observer(self, comments):
+            self.comment_total = len(comments)
+
+        comments = sa.orm.relationship('Comment', backref='thread')
+    return Thread
+
+
+@pytest.fixture
+def Comment(Base):
+    class Comment(Base):
+        __tablename__ = 'comment'
+        id = sa.Column(sa.Integer, primary_key=True)
+        thread_id = sa.Column(sa.Integer, sa.ForeignKey('thread.id'))
+    return Comment
+
+
+@pytest.fixture
+def init_models(Thread, Comment):
+    pass
+
+
+@pytest.fixture
+def stats():
+    stats = StatsCollector()
+    instrumentation.sink = stats
+    yield stats
+    instrumentation.sink = None
+
+
+class TestInstrumentation:
+
+    def test_measures_aggregates(self, session, Thread, Comment, stats):
+        thread = Thread()
+        session.add_all([thread, Comment(thread=thread), Comment(thread=thread)])
+        session.flush()
+        aggregate = stats.totals[('aggregate', 'Thread.comment_count')]
+        assert aggregate.calls == 1
+        assert aggregate.objects == 1
+        assert aggregate.statements == 1
+        assert aggregate.rows == 1
+        flush = stats.totals[('aggregate.flush', 'after_flush')]
+        assert flush.calls == 1
+        assert flush.objects == 3
+        assert flush.statements == 1
+
+    def test_measures_observers(self, session, Thread, Comment, stats):
+        thread = Thread()
+        session.add_all([thread, Comment(thread=thread), Comment(thread=thread)])
+        session.flush()
+        name = Thread.comment_observer.__qualname__
+        observer = stats.totals[('observer', name)]
+        assert observer.calls == 1
+        assert observer.objects == 2
+        assert observer.statements == 0
+        assert stats.totals[('observer.flush', 'before_flush')].objects == 3
+
+    def test_disabled_by_default(self, session, Thread, stats):
+        instrumentation.sink = None
+        session.add(Thread())
+        session.flush()
+        assert stats.totals == {}
+
+    def test_disabled_does_not_count_objects(
+        self,
+        session,
+        Thread,
+        stats,
+        monkeypatch
+    ):
+        calls = []
+        session_dirty = sa.orm.Session.dirty
+
+        def dirty(session):
+            calls.append(session)
+            return session_dirty.fget(session)
+
+        monkeypatch.setattr(sa.orm.Session, 'dirty', property(dirty))
+        session.add(Thread())
+        session.flush()
+        enabled_calls = len(calls)
+        del calls[:]
+
+        instrumentation.sink = None
+        session.add(Thread())
+        session.flush()
+        assert len(calls) == enabled_calls - 1
+
+
+class TestSinks:
+
+    @pytest.fixture
+    def measurement(self):
+        return Measurement('aggregate', 'Thread.comment_count', 0.5, 2, 1, 1)
+
+    def test_logging_sink(self, measurement, caplog):
+        with caplog.at_level(logging.DEBUG):
+            LoggingSink()(measurement)
+        assert caplog.messages == [
+            'aggregate Thread.comment_count: 0.500000s, 2 objects, '
+            '1 statements, 1 rows'
+        ]
+
+    def test_statsd_sink(self, measurement):
+        calls = []
+
+        class Client:
+            def incr(self, stat, count):
+                calls.append(('incr', stat, count))
+
+            def timing(self, stat, ms):
+                calls.append(('timing', stat, ms))
+
+        StatsdSink(Client(), prefix='app')(measurement)
+        stat = 'app.aggregate.Thread.comment_count'
+        assert calls == [
+            ('incr', f'{stat}.calls', 1),
+            ('timing', f'{stat}.duration', 500.0),
+            ('incr', f'{stat}.objects', 2),
+            ('incr', f'{stat}.statements', 1),
+            ('incr', f'{stat}.rows', 1),
+        ]
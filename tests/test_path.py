@@ -1,7 +1,7 @@
 import pytest
 import sqlalchemy as sa
 
-from sqlalchemy_utils.path import AttrPath, Path
+from sqlalchemy_utils.path import AttrPath, get_attr_path, Path
 
 
 @pytest.fixture
@@ -120,6 +120,17 @@ class TestAttrPath:
             AttrPath(SubSection, 'section.document')
         )
 
+    def test_get_attr_path_is_cached(self, Section, SubSection):
+        path = get_attr_path(SubSection, 'section.document')
+        assert path == AttrPath(SubSection, 'section.document')
+        assert get_attr_path(SubSection, 'section.document') is path
+        assert path[1:] is get_attr_path(Section, 'document')
+
+    def test_invert_is_cached(self, SubSection):
+        path = get_attr_path(SubSection, 'section.document')
+        assert ~path is ~path
+        assert ~~path is path
+
 
 class TestPath:
     def test_init(self):
@@ -1,11 +1,19 @@
 import random
 import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time
 
 import pytest
 import sqlalchemy as sa
 
-from sqlalchemy_utils import ColorType, PhoneNumberType, StringEncryptedType
+from sqlalchemy_utils import (
+    ColorType,
+    Keyring,
+    PhoneNumberType,
+    reencrypt_column,
+    StringEncryptedType
+)
+from sqlalchemy_utils.exceptions import ImproperlyConfigured
 from sqlalchemy_utils.types import JSONType
 from sqlalchemy_utils.types.encrypted.encrypted_type import (
     AesEngine,
@@ -547,3 +555,452 @@ class TestAesGcmEncryptedType(EncryptedTypeTestCase):
         # we're really searching for the same username. Hence, the above search
         # will fail
         assert test is None
+
+
+@pytest.mark.skipif('cryptography is None')
+class TestEngineKeyCache:
+
+    @pytest.fixture(params=[AesEngine, AesGcmEngine, FernetEngine])
+    def engine(self, request):
+        engine = request.param()
+        if isinstance(engine, AesEngine):
+            engine._set_padding_mechanism('pkcs5')
+        return engine
+
+    @pytest.fixture
+    def derivations(self, engine, monkeypatch):
+        keys = []
+        initialize_engine = engine._initialize_engine
+
+        def counting_initialize_engine(key):
+            keys.append(key)
+            initialize_engine(key)
+
+        monkeypatch.setattr(engine, '_initialize_engine', counting_initialize_engine)
+        return keys
+
+    def test_derives_each_key_once(self, engine, derivations):
+        engine._update_key('one')
+        encrypted = engine.encrypt('value')
+        engine._update_key('two')
+        engine._update_key('one')
+        engine._update_key(b'one')
+        assert engine.decrypt(encrypted) == 'value'
+        assert len(derivations) == 2
+
+    def test_picks_up_changed_key(self, engine, derivations):
+        engine._update_key('one')
+        encrypted = engine.encrypt('value')
+        engine._update_key('two')
+        other_encrypted = engine.encrypt('value')
+        assert other_encrypted != encrypted
+        engine._update_key('one')
+        assert engine.decrypt(encrypted) == 'value'
+        engine._update_key('two')
+        assert engine.decrypt(other_encrypted) == 'value'
+
+    def test_evicts_least_recently_used_keys(
+        self,
+        engine,
+        derivations,
+        monkeypatch
+    ):
+        monkeypatch.setattr(engine, 'key_cache_size', 2)
+        for key in ['one', 'two', 'one', 'three', 'one', 'two']:
+            engine._update_key(key)
+        assert len(engine._key_cache) == 2
+        assert len(derivations) == 4
+
+
+@pytest.mark.skipif('cryptography is None')
+class TestDecryptMany:
+
+    @pytest.fixture(params=[AesEngine, AesGcmEngine, FernetEngine])
+    def type_(self, request):
+        return StringEncryptedType(sa.Integer, 'secret', request.param, 'pkcs5')
+
+    @pytest.fixture
+    def ciphertexts(self, type_):
+        return [
+            None if number % 7 == 0 else type_.process_bind_param(number, None)
+            for number in range(50)
+        ]
+
+    @pytest.fixture
+    def expected(self, type_, ciphertexts):
+        return [type_.process_result_value(value, None) for value in ciphertexts]
+
+    def test_preserves_order(self, type_, ciphertexts, expected):
+        assert type_.decrypt_many(
+            ciphertexts, max_workers=4, chunk_size=3
+        ) == expected
+
+    def test_single_thread(self, type_, ciphertexts, expected):
+        assert type_.decrypt_many(ciphertexts, max_workers=1) == expected
+
+    def test_executor(self, type_, ciphertexts, expected):
+        with ThreadPoolExecutor(2) as executor:
+            assert type_.decrypt_many(
+                ciphertexts, chunk_size=10, executor=executor
+            ) == expected
+
+    def test_raises_invalid_values(self, type_, ciphertexts):
+        ciphertexts[3] = 'invalid'
+        with pytest.raises(Exception):
+            type_.decrypt_many(ciphertexts, max_workers=4, chunk_size=3)
+
+    def test_returns_exceptions(self, type_, ciphertexts, expected):
+        ciphertexts[3] = 'invalid'
+        values = type_.decrypt_many(
+            ciphertexts, max_workers=4, chunk_size=3, return_exceptions=True
+        )
+        assert isinstance(values[3], Exception)
+        assert values[:3] + values[4:] == expected[:3] + expected[4:]
+
+    def test_aes_gcm_invalid_ciphertext(self):
+        type_ = StringEncryptedType(sa.Unicode, 'secret', AesGcmEngine)
+        ciphertext = type_.process_bind_param('value', None)
+        values = type_.decrypt_many(
+            [ciphertext, ciphertext[:-4] + 'AAAA'], return_exceptions=True
+        )
+        assert values[0] == 'value'
+        assert isinstance(values[1], InvalidCiphertextError)
+
+
+@pytest.mark.skipif('cryptography is None')
+class TestReencryptColumn:
+
+    @pytest.fixture(params=[AesEngine, AesGcmEngine, FernetEngine])
+    def encryption_engine(self, request):
+        return request.param
+
+    @pytest.fixture
+    def keys(self):
+        return ['old']
+
+    @pytest.fixture
+    def Secret(self, Base, keys, encryption_engine):
+        class Secret(Base):
+            __tablename__ = 'secret'
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+            value = sa.Column(StringEncryptedType(
+                sa.Unicode,
+                lambda: keys[0],
+                encryption_engine,
+                'pkcs5'
+            ))
+        return Secret
+
+    @pytest.fixture
+    def init_models(self, Secret):
+        pass
+
+    @pytest.fixture
+    def secrets(self, session, Secret):
+        secrets = [
+            Secret(name=str(index), value=None if index == 3 else f'value {index}')
+            for index in range(7)
+        ]
+        session.add_all(secrets)
+        session.commit()
+        ids = [secret.id for secret in secrets]
+        session.expunge_all()
+        return ids
+
+    def test_reencrypts_values(self, session, Secret, keys, secrets):
+        batches = []
+        count = reencrypt_column(
+            session,
+            Secret.value,
+            'old',
+            'new',
+            batch_size=2,
+            progress=lambda count, elapsed: batches.append(count)
+        )
+        assert count == 6
+        assert batches == [2, 4, 6]
+        keys[0] = 'new'
+        assert [
+            secret.value
+            for secret in session.query(Secret).order_by(Secret.id)
+        ] == [None if index == 3 else f'value {index}' for index in range(7)]
+
+    def test_where(self, session, Secret, keys, secrets):
+        count = reencrypt_column(
+            session,
+            Secret.value,
+            'old',
+            'new',
+            where=Secret.name.in_(['1', '2'])
+        )
+        assert count == 2
+        keys[0] = 'new'
+        assert session.get(Secret, secrets[1]).value == 'value 1'
+
+    def test_requires_encrypted_attribute(self, session, Secret):
+        with pytest.raises(ValueError):
+            reencrypt_column(session, Secret.name, 'old', 'new')
+
+
+@pytest.mark.skipif('cryptography is None')
+class TestKeyring:
+
+    @pytest.fixture(params=[AesEngine, AesGcmEngine, FernetEngine])
+    def encryption_engine(self, request):
+        return request.param
+
+    @pytest.fixture
+    def keyring(self):
+        return Keyring({'1': 'old key', '2': 'new key'}, active='1')
+
+    @pytest.fixture
+    def Secret(self, Base, keyring, encryption_engine):
+        class Secret(Base):
+            __tablename__ = 'secret'
+            id = sa.Column(sa.Integer, primary_key=True)
+            value = sa.Column(StringEncryptedType(
+                sa.Unicode,
+                keyring,
+                encryption_engine,
+                'pkcs5'
+            ))
+        return Secret
+
+    @pytest.fixture
+    def init_models(self, Secret):
+        pass
+
+    def stored_values(self, session, Secret):
+        return session.scalars(
+            sa.select(sa.type_coerce(Secret.value, sa.String))
+            .order_by(Secret.id)
+        ).all()
+
+    def test_reads_values_of_all_keys(self, session, Secret, keyring):
+        session.add(Secret(value='old'))
+        session.commit()
+        keyring.active = '2'
+        session.add(Secret(value='new'))
+        session.commit()
+        session.expunge_all()
+
+        stored = self.stored_values(session, Secret)
+        assert [value[:2] for value in stored] == ['1:', '2:']
+        assert [
+            secret.value for secret in session.query(Secret).order_by(Secret.id)
+        ] == ['old', 'new']
+        assert Secret.__table__.c.value.type.decrypt_many(
+            stored, max_workers=2, chunk_size=1
+        ) == ['old', 'new']
+
+    def test_unknown_key_id(self, session, Secret):
+        type_ = Secret.__table__.c.value.type
+        with pytest.raises(InvalidCiphertextError):
+            type_.process_result_value('3:abc', None)
+
+    def test_untagged_values(self, Secret, keyring, encryption_engine):
+        untagged = StringEncryptedType(
+            sa.Unicode,
+            'old key',
+            encryption_engine,
+            'pkcs5'
+        ).process_bind_param('legacy', None)
+        type_ = Secret.__table__.c.value.type
+        with pytest.raises(InvalidCiphertextError):
+            type_.process_result_value(untagged, None)
+        keyring.untagged = '1'
+        assert type_.process_result_value(untagged, None) == 'legacy'
+
+    def test_reencrypt_with_active_key(self, session, Secret, keyring):
+        session.add_all([Secret(value='first'), Secret(value='second')])
+        session.commit()
+        keyring.active = '2'
+        session.add(Secret(value='third'))
+        session.commit()
+        session.expunge_all()
+
+        prefix = keyring.active + keyring.separator
+        count = reencrypt_column(
+            session,
+            Secret.value,
+            keyring,
+            keyring,
+            where=~sa.type_coerce(Secret.value, sa.String).startswith(prefix)
+        )
+        assert count == 2
+        assert all(
+            value.startswith(prefix)
+            for value in self.stored_values(session, Secret)
+        )
+        del keyring.keys['1']
+        assert [
+            secret.value for secret in session.query(Secret).order_by(Secret.id)
+        ] == ['first', 'second', 'third']
+
+    def test_callable_key_rotation(self, Secret, keyring, encryption_engine):
+        material = ['first key']
+        keyring.keys['3'] = lambda: material[0]
+        keyring.active = '3'
+        type_ = Secret.__table__.c.value.type
+        type_.process_bind_param('secret', None)
+        material[0] = 'second key'
+        value = type_.process_bind_param('secret', None)
+        assert StringEncryptedType(
+            sa.Unicode,
+            'second key',
+            encryption_engine,
+            'pkcs5'
+        ).process_result_value(value[2:], None) == 'secret'
+        assert type_.process_result_value(value, None) == 'secret'
+
+    def test_invalid_key_ids(self):
+        with pytest.raises(ImproperlyConfigured):
+            Keyring({'a:b': 'key'}, active='a:b')
+        with pytest.raises(ImproperlyConfigured):
+            Keyring({'a': 'key'}, active='b')
+
+
+@pytest.mark.skipif('cryptography is None')
+class TestBlindIndex:
+
+    @pytest.fixture(params=[AesEngine, AesGcmEngine, FernetEngine])
+    def encryption_engine(self, request):
+        return request.param
+
+    @pytest.fixture
+    def User(self, Base, encryption_engine):
+        class User(Base):
+            __tablename__ = 'user'
+            id = sa.Column(sa.Integer, primary_key=True)
+            email = sa.Column(StringEncryptedType(
+                sa.Unicode(255),
+                'secret',
+                encryption_engine,
+                'pkcs5',
+                blind_index='email_index',
+                blind_index_key='index key'
+            ))
+            email_index = sa.Column(sa.String(64), index=True)
+        return User
+
+    @pytest.fixture
+    def init_models(self, User):
+        pass
+
+    @pytest.fixture
+    def users(self, session, User):
+        users = [User(email=email) for email in ['a@a.com', 'b@b.com', None]]
+        session.add_all(users)
+        session.commit()
+        return users
+
+    def test_assigns_digest(self, User, users):
+        type_ = User.__table__.c.email.type
+        assert users[0].email_index == type_.blind_index_digest('a@a.com')
+        assert len(users[0].email_index) == 64
+        assert users[2].email_index is None
+
+    def test_digest_is_keyed(self, User):
+        type_ = User.__table__.c.email.type
+        other_type = StringEncryptedType(
+            sa.Unicode,
+            'secret',
+            blind_index='email_index',
+            blind_index_key='other key'
+        )
+        assert type_.blind_index_digest('a') == type_.blind_index_digest('a')
+        assert type_.blind_index_digest('a') != other_type.blind_index_digest('a')
+
+    def test_equality_compares_blind_index(self, session, User, users):
+        query = session.query(User).filter(User.email == 'b@b.com')
+        assert 'email_index' in str(query.statement.whereclause)
+        assert query.one() is users[1]
+        assert session.query(User).filter(User.email != 'b@b.com').all() == [
+            users[0]
+        ]
+        assert session.query(User).filter(User.email.is_(None)).one() is users[2]
+
+    def test_in(self, session, User, users):
+        assert session.query(User).filter(
+            User.email.in_(['a@a.com', 'b@b.com', 'c@c.com'])
+        ).order_by(User.id).all() == users[:2]
+
+    def test_updates_blind_index(self, session, User, users):
+        users[0].email = 'c@c.com'
+        session.commit()
+        assert session.query(User).filter(User.email == 'c@c.com').one() is users[0]
+        assert session.query(User).filter(User.email == 'a@a.com').count() == 0
+
+    def test_requires_blind_index_key(self):
+        with pytest.raises(ImproperlyConfigured):
+            StringEncryptedType(sa.Unicode, 'secret', blind_index='email_index')
+
+
+@pytest.mark.skipif('cryptography is None')
+class TestBlindIndexInheritance:
+
+    @pytest.fixture
+    def User(self, Base):
+        class User(Base):
+            __tablename__ = 'user'
+            id = sa.Column(sa.Integer, primary_key=True)
+            type = sa.Column(sa.Unicode(50))
+            email = sa.Column(StringEncryptedType(
+                sa.Unicode(255),
+                'secret',
+                blind_index='email_index',
+                blind_index_key='index key'
+            ))
+            email_index = sa.Column(sa.String(64), index=True)
+
+            __mapper_args__ = {
+                'polymorphic_on': type,
+                'polymorphic_identity': 'user'
+            }
+        return User
+
+    @pytest.fixture
+    def Admin(self, User):
+        class Admin(User):
+            __mapper_args__ = {'polymorphic_identity': 'admin'}
+        return Admin
+
+    @pytest.fixture
+    def Moderator(self, User):
+        class Moderator(User):
+            __tablename__ = 'moderator'
+            id = sa.Column(sa.Integer, sa.ForeignKey(User.id), primary_key=True)
+            __mapper_args__ = {'polymorphic_identity': 'moderator'}
+        return Moderator
+
+    @pytest.fixture
+    def init_models(self, User, Admin, Moderator):
+        pass
+
+    @pytest.fixture
+    def users(self, session, User, Admin, Moderator):
+        users = [
+            User(email='a@a.com'),
+            Admin(email='b@b.com'),
+            Moderator(email='c@c.com'),
+        ]
+        session.add_all(users)
+        session.commit()
+        return users
+
+    def test_assigns_digest_for_subclass_objects(self, User, users):
+        type_ = User.__table__.c.email.type
+        assert [user.email_index for user in users] == [
+            type_.blind_index_digest(email)
+            for email in ['a@a.com', 'b@b.com', 'c@c.com']
+        ]
+
+    def test_finds_subclass_objects(self, session, User, Admin, users):
+        assert session.query(User).filter(User.email == 'b@b.com').one() is users[1]
+        assert session.query(Admin).filter(Admin.email == 'b@b.com').one() is (
+            users[1]
+        )
+        assert session.query(User).filter(
+            User.email.in_(['b@b.com', 'c@c.com'])
+        ).order_by(User.id).all() == users[1:]